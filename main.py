@@ -1,8 +1,22 @@
+import argparse
+import bisect
+import hashlib
+import itertools
+import json
+import mmap
 import os
+import posixpath
 import random
-import subprocess
+import re
+import shutil
+import struct
+import sys
 import time
-from datetime import datetime, timedelta
+import zlib
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 
 # ==============================================================================
 # [CONFIGURATION]
@@ -16,18 +30,68 @@ USER_EMAIL = "194120946+lynk-labs@users.noreply.github.com"
 START_DATE = datetime(2025, 12, 15, 9, 0, 0)
 END_DATE = datetime(2026, 1, 12, 11, 0, 0)
 TARGET_COMMITS = 135
+SEED = None # Set for reproducible timelines and filler choices
+VERBOSE = True # Rate-limited progress display on stdout
+EVENT_LOG = None # Path of a JSON-lines event log (git calls, file writes, timeline, commits, phase totals)
+PROGRESS_INTERVAL = 0.5 # Seconds between progress lines
+
+# Timeline: "stream" (lazy, pure Python) or "numpy" (vectorized activity model below)
+TIMELINE_ENGINE = "stream"
+WEEKDAY_WEIGHTS = (1, 1, 1, 1, 1, 1, 1) # Relative activity Mon..Sun, e.g. (1, 1, 1, 1, 1, 0.3, 0.3)
+TZ_OFFSET_MINUTES = None # Fixed UTC offset for dates and working hours; None = local zone
+BURST_PROBABILITY = 0.0 # Chance that a commit follows the previous one closely instead of its own slot
+BURST_GAP_SECONDS = 900 # Mean gap inside a burst
+
+# Filler commits: "files" rotates short notes through FILLER_FILES small files under FILLER_DIR, each capped at
+# FILLER_FILE_BUDGET bytes; "churn" makes small line-level edits (comment lines) to the TypeScript sources;
+# "readme" is the old behaviour (README.md grows by a newline per commit)
+FILLER_MODE = "files"
+FILLER_DIR = ".changeset"
+FILLER_FILES = 16
+FILLER_FILE_BUDGET = 1024
+
+# History shape: False keeps one linear main; True develops the BRANCH_FEATURES phases of TASKS on feature branches
+# and other commits on short topic branches, each merged back into main by a merge commit whose tree is computed in
+# memory (fast-import and pack engines)
+BRANCHES = False
+BRANCH_PROBABILITY = 0.2 # Chance that a commit made while no branch is open starts a topic branch
+BRANCH_COMMITS = 4 # Most commits a branch collects before it is merged
+
+# Commit backend: "fast-import" (one streamed `git fast-import`), "pack" (in-process packfile writer,
+# no git binary needed), "sharded" (the pack writer spread over worker processes, same packs as "pack")
+# or "subprocess" (git add/commit per commit)
+ENGINE = "fast-import"
+MAX_DELTA_DEPTH = 50
+BLOB_CACHE_BYTES = 64 << 20 # Raw + compressed bytes kept by the blob store before LRU eviction
+CHECKPOINT_EVERY = 1000 # Commits between journal checkpoints (0 = only the final record)
+JOURNAL_NAME = "lynk-journal.json" # Kept inside .git so it never lands in a commit
+SHARD_JOBS = None # Worker processes of the sharded engine (None = one per core)
+SHARD_COMMITS = 1000 # Commits per shard when CHECKPOINT_EVERY is 0 (packs are then sealed per shard)
+SHARD_PLAN_NAME = "lynk-shard.plan" # Plan a sharded run decides into .git, removed when the run finishes
+# Seeded runs are cached by configuration and restored instead of regenerated (None disables the cache)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lynk")
+CACHE_BYTES = 2 << 30 # Disk budget; least recently used repositories are evicted past it
+SHARED_STORE = None # Object directory shared by a batch through git alternates (see `detach`); None = standalone
+# Finalization: after the run, repack into one pack with reachability bitmaps and write a commit-graph and a
+# multi-pack-index, so `git log`, clone and fetch are fast without anyone running maintenance by hand
+FINALIZE = False
+DAEMON_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "lynk", "daemon.sock") # Where `daemon` takes jobs
+DAEMON_WORKERS = None # Warm worker processes of the daemon (None = one per core)
 
 # Helpers
-BT = "```" 
 BANNER_PATH = "./lynk.png"
+ASSET_DIR = "assets" # Binary assets for TASKS (e.g. the BANNER_PATH image) are streamed from here
+ASSET_CHUNK = 1 << 20 # Bytes per hashing/compression/write step; assets are never loaded whole
+# Per-repository variables for the CONTENT_* templates, e.g. {"name": "Acme", "version": "2.0.0"} (see template_values)
+TEMPLATE_VARS = {}
 
 # ==============================================================================
 # [1. DOCUMENTATION (README.md) - NO EMOJI, PROFESSIONAL]
 # ==============================================================================
-CONTENT_README = f"""# LYNK: The Unbreakable Wallet Adapter
+CONTENT_README = """# {% title %}: The Unbreakable Wallet Adapter
 
 <div align="center">
-  <img src="{BANNER_PATH}" alt="LYNK Banner" width="100%" />
+  <img src="{% banner %}" alt="{% title %} Banner" width="100%" />
   <br />
   <br />
   <p align="center">
@@ -36,12 +100,12 @@ CONTENT_README = f"""# LYNK: The Unbreakable Wallet Adapter
     <img src="https://img.shields.io/badge/TypeScript-Strict-3178C6?style=for-the-badge&logo=typescript&logoColor=white" alt="TypeScript" />
     <img src="https://img.shields.io/badge/License-MIT-green?style=for-the-badge" alt="License" />
     <img src="https://img.shields.io/badge/Status-Stable-success?style=for-the-badge" alt="Status" />
-    <a href="https://x.com/lynk_labs">
+    <a href="https://x.com/{% slug %}_labs">
       <img src="https://img.shields.io/badge/X-Follow_Us-black?style=for-the-badge&logo=x&logoColor=white" alt="X" />
     </a>
   </p>
   <p align="center">
-    <strong>Stay connected. Lynk up.</strong>
+    <strong>Stay connected. {% name %} up.</strong>
   </p>
 </div>
 
@@ -49,9 +113,9 @@ CONTENT_README = f"""# LYNK: The Unbreakable Wallet Adapter
 
 ## 1. Abstract
 
-**LYNK** is a specialized React hook and provider designed to solve the "Broken Chain" problem in Solana dApps. Standard wallet adapters often disconnect upon page refreshes or minor network jitters, causing user drop-off. 
+**{% title %}** is a specialized React hook and provider designed to solve the "Broken Chain" problem in Solana dApps. Standard wallet adapters often disconnect upon page refreshes or minor network jitters, causing user drop-off. 
 
-LYNK introduces a **Persistent Session Layer** combined with an **Auto-Healing Mechanism** that utilizes exponential backoff strategies to maintain wallet connectivity seamlessly.
+{% title %} introduces a **Persistent Session Layer** combined with an **Auto-Healing Mechanism** that utilizes exponential backoff strategies to maintain wallet connectivity seamlessly.
 
 ---
 
@@ -75,13 +139,13 @@ Protects against "Wallet Not Found" race conditions during DOM hydration by queu
 
 Since this package is currently in private beta or used internally, install it directly from the repository:
 
-{BT}bash
+```bash
 # Install via Git
-npm install git+[https://github.com/lynk-labs/lynk.git](https://github.com/lynk-labs/lynk.git)
+npm install git+[https://github.com/{% repo %}.git](https://github.com/{% repo %}.git)
 
 # Peer dependencies
 npm install @solana/wallet-adapter-react @solana/web3.js
-{BT}
+```
 
 ---
 
@@ -89,62 +153,62 @@ npm install @solana/wallet-adapter-react @solana/web3.js
 
 ### 4.1. Setup Provider
 
-Wrap your application with `LynkProvider`. This replaces the standard `WalletProvider` but requires the `ConnectionProvider` to be an ancestor.
+Wrap your application with `{% name %}Provider`. This replaces the standard `WalletProvider` but requires the `ConnectionProvider` to be an ancestor.
 
-{BT}tsx
-import {{ LynkProvider }} from '@lynk-protocol/react';
-import {{ PhantomWalletAdapter, SolflareWalletAdapter }} from '@solana/wallet-adapter-wallets';
-import {{ ConnectionProvider }} from '@solana/wallet-adapter-react';
+```tsx
+import { {% name %}Provider } from '{% package %}';
+import { PhantomWalletAdapter, SolflareWalletAdapter } from '@solana/wallet-adapter-wallets';
+import { ConnectionProvider } from '@solana/wallet-adapter-react';
 
 const wallets = [new PhantomWalletAdapter(), new SolflareWalletAdapter()];
 const endpoint = "[https://api.mainnet-beta.solana.com](https://api.mainnet-beta.solana.com)";
 
 const App = () => (
-    <ConnectionProvider endpoint={{endpoint}}>
-        <LynkProvider 
-            wallets={{wallets}} 
-            autoConnect={{{{ strategy: 'aggressive', timeout: 5000 }}}}
-            onError={{(err) => console.error("Lynk Error:", err)}}
+    <ConnectionProvider endpoint={endpoint}>
+        <{% name %}Provider 
+            wallets={wallets} 
+            autoConnect={{ strategy: 'aggressive', timeout: 5000 }}
+            onError={(err) => console.error("{% name %} Error:", err)}
         >
             <YourApp />
-        </LynkProvider>
+        </{% name %}Provider>
     </ConnectionProvider>
 );
-{BT}
+```
 
-### 4.2. useLynk Hook
+### 4.2. use{% name %} Hook
 
 Access the connection state and manual controls.
 
-{BT}tsx
-import {{ useLynk }} from '@lynk-protocol/react';
+```tsx
+import { use{% name %} } from '{% package %}';
 
-const ConnectButton = () => {{
-    const {{ connected, connecting, heal, disconnect }} = useLynk();
+const ConnectButton = () => {
+    const { connected, connecting, heal, disconnect } = use{% name %}();
 
-    if (connecting) return <span>Establishing Lynk...</span>;
+    if (connecting) return <span>Establishing {% name %}...</span>;
     
-    if (!connected) {{
+    if (!connected) {
         return (
-            <button onClick={{heal}} className="btn-primary">
+            <button onClick={heal} className="btn-primary">
                 Relink Wallet
             </button>
         );
-    }}
+    }
 
     return (
-        <div onClick={{disconnect}}>
+        <div onClick={disconnect}>
             Wallet Linked! (Click to Unlink)
         </div>
     );
-}};
-{BT}
+};
+```
 
 ---
 
 ## 5. Architecture
 
-LYNK implements a specialized State Machine for connection management:
+{% title %} implements a specialized State Machine for connection management:
 
 1.  **IDLE**: No session detected.
 2.  **LINKING**: Session detected, attempting handshake.
@@ -156,7 +220,7 @@ LYNK implements a specialized State Machine for connection management:
 
 ## 6. License
 
-Copyright © 2026 LYNK Labs.
+Copyright © 2026 {% author %}.
 Licensed under the **MIT License**.
 """
 
@@ -185,8 +249,8 @@ CONTENT_TSCONFIG = """{
 """
 
 CONTENT_PACKAGE_JSON = """{
-  "name": "@lynk-protocol/react",
-  "version": "1.0.4",
+  "name": "{% package %}",
+  "version": "{% version %}",
   "description": "The Unbreakable Wallet Adapter for Solana",
   "main": "dist/index.js",
   "module": "dist/index.mjs",
@@ -205,7 +269,7 @@ CONTENT_PACKAGE_JSON = """{
     "hook",
     "reconnect"
   ],
-  "author": "LYNK Labs",
+  "author": "{% author %}",
   "license": "MIT",
   "peerDependencies": {
     "@solana/wallet-adapter-base": "^0.9.23",
@@ -251,7 +315,7 @@ export interface AutoConnectConfig {
     timeout?: number;
 }
 
-export interface LynkConfig {
+export interface {% name %}Config {
     /**
      * Configuration for the auto-connection and healing mechanism.
      */
@@ -259,7 +323,7 @@ export interface LynkConfig {
     
     /**
      * Optional key prefix for local storage to avoid collisions.
-     * @default 'lynk_v1_'
+     * @default '{% slug %}_v1_'
      */
     storagePrefix?: string;
     
@@ -269,7 +333,7 @@ export interface LynkConfig {
     onError?: (error: Error) => void;
 }
 
-export interface LynkContextState {
+export interface {% name %}ContextState {
     /** Whether the wallet is currently connected */
     connected: boolean;
     
@@ -293,13 +357,13 @@ export interface LynkContextState {
     /** The current session signature (if any) */
     sessionSignature: string | null;
 }
-"""
+{% note %}"""
 
 CONTENT_STORAGE_TS = """/**
  * Utils for managing persistent session state.
  */
 
-const DEFAULT_PREFIX = 'lynk_v1_';
+const DEFAULT_PREFIX = '{% slug %}_v1_';
 
 export class SessionManager {
     private prefix: string;
@@ -328,7 +392,7 @@ export class SessionManager {
         try {
             localStorage.setItem(this.getKey('session'), JSON.stringify(sessionData));
         } catch (e) {
-            console.error('[LYNK] Failed to save session:', e);
+            console.error('[{% title %}] Failed to save session:', e);
         }
     }
 
@@ -396,18 +460,18 @@ export async function attemptHealing(
     for (let attempt = 1; attempt <= maxAttempts; attempt++) {
         try {
             if (checkFn()) {
-                console.log(`[LYNK] Healing check passed at attempt ${attempt}.`);
+                console.log(`[{% title %}] Healing check passed at attempt ${attempt}.`);
                 return true;
             }
 
-            console.log(`[LYNK] Healing attempt ${attempt}/${maxAttempts}. Waiting ${delay}ms...`);
+            console.log(`[{% title %}] Healing attempt ${attempt}/${maxAttempts}. Waiting ${delay}ms...`);
             await wait(delay);
             await connectFn();
             
             // Success if we reach here without error
             return true;
         } catch (e) {
-            console.warn(`[LYNK] Attempt ${attempt} failed:`, e);
+            console.warn(`[{% title %}] Attempt ${attempt} failed:`, e);
             delay *= backoffFactor;
             
             // Cap the delay at 5 seconds
@@ -424,48 +488,48 @@ export async function attemptHealing(
 CONTENT_PROVIDER_TSX = """import React, { createContext, useEffect, useState, useCallback, ReactNode, useRef } from 'react';
 import { useWallet, WalletProvider } from '@solana/wallet-adapter-react';
 import { Adapter } from '@solana/wallet-adapter-base';
-import { LynkContextState, LynkConfig } from './types';
+import { {% name %}ContextState, {% name %}Config } from './types';
 import { SessionManager } from './utils/storage';
 import { attemptHealing } from './utils/reconnect';
 
-export const LynkContext = createContext<LynkContextState>({} as LynkContextState);
+export const {% name %}Context = createContext<{% name %}ContextState>({} as {% name %}ContextState);
 
-interface LynkProviderProps extends LynkConfig {
+interface {% name %}ProviderProps extends {% name %}Config {
     children: ReactNode;
     wallets: Adapter[];
     onError?: (error: Error) => void;
 }
 
 // Fixed: Explicit type annotation for props to satisfy TS strict mode
-export const LynkProvider = ({ 
+export const {% name %}Provider = ({ 
     children, 
     wallets, 
     autoConnect = true,
     storagePrefix,
     onError
-}: LynkProviderProps) => {
-    // We pass autoConnect=false to the inner WalletProvider because LYNK handles it manually
+}: {% name %}ProviderProps) => {
+    // We pass autoConnect=false to the inner WalletProvider because {% title %} handles it manually
     // to provide the "Healing" capabilities.
     return (
         <WalletProvider wallets={wallets} autoConnect={false}>
-            <LynkInner 
+            <{% name %}Inner 
                 config={{ autoConnect, storagePrefix, onError }} 
                 wallets={wallets}
             >
                 {children}
-            </LynkInner>
+            </{% name %}Inner>
         </WalletProvider>
     );
 };
 
 interface InnerProps {
     children: ReactNode;
-    config: LynkConfig;
+    config: {% name %}Config;
     wallets: Adapter[];
 }
 
 // Fixed: Explicit type annotation for InnerProps
-const LynkInner = ({ children, config, wallets }: InnerProps) => {
+const {% name %}Inner = ({ children, config, wallets }: InnerProps) => {
     const { 
         connected, 
         connecting, 
@@ -490,7 +554,7 @@ const LynkInner = ({ children, config, wallets }: InnerProps) => {
 
             const session = sessionManager.current.getSession();
             if (session && config.autoConnect) {
-                console.log(`[LYNK] Found session for ${session.walletName}. Initiating healing...`);
+                console.log(`[{% title %}] Found session for ${session.walletName}. Initiating healing...`);
                 
                 // Select the wallet first
                 select(session.walletName as any);
@@ -531,7 +595,7 @@ const LynkInner = ({ children, config, wallets }: InnerProps) => {
                 throw new Error("Healing sequence exhausted.");
             }
         } catch (e) {
-            console.error("[LYNK] Healing failed:", e);
+            console.error("[{% title %}] Healing failed:", e);
             // Clear session if we truly can't reconnect
             sessionManager.current.clearSession();
             if (config.onError) config.onError(e as Error);
@@ -546,7 +610,7 @@ const LynkInner = ({ children, config, wallets }: InnerProps) => {
         await baseDisconnect();
     }, [baseDisconnect]);
 
-    const contextValue: LynkContextState = {
+    const contextValue: {% name %}ContextState = {
         connected,
         connecting: connecting || isHealing,
         disconnecting,
@@ -557,31 +621,31 @@ const LynkInner = ({ children, config, wallets }: InnerProps) => {
     };
 
     return (
-        <LynkContext.Provider value={contextValue}>
+        <{% name %}Context.Provider value={contextValue}>
             {children}
-        </LynkContext.Provider>
+        </{% name %}Context.Provider>
     );
 };
-"""
+{% note %}"""
 
 CONTENT_HOOK_TS = """import { useContext } from 'react';
-import { LynkContext } from './provider';
-import { LynkContextState } from './types';
+import { {% name %}Context } from './provider';
+import { {% name %}ContextState } from './types';
 
 /**
- * useLynk
- * The primary hook for interacting with the LYNK protocol.
+ * use{% name %}
+ * The primary hook for interacting with the {% title %} protocol.
  * Provides wallet connection state, healing methods, and session info.
- * @throws {Error} If used outside of a LynkProvider
- * @returns {LynkContextState}
+ * @throws {Error} If used outside of a {% name %}Provider
+ * @returns {{% name %}ContextState}
  */
-export function useLynk(): LynkContextState {
-    const context = useContext(LynkContext);
+export function use{% name %}(): {% name %}ContextState {
+    const context = useContext({% name %}Context);
     
     if (!context) {
         throw new Error(
-            'useLynk must be used within a LynkProvider. ' +
-            'Wrap your application in <LynkProvider>.'
+            'use{% name %} must be used within a {% name %}Provider. ' +
+            'Wrap your application in <{% name %}Provider>.'
         );
     }
     
@@ -590,13 +654,13 @@ export function useLynk(): LynkContextState {
 """
 
 CONTENT_INDEX_TS = """/**
- * LYNK Protocol - React SDK
+ * {% title %} Protocol - React SDK
  * @packageDocumentation
- * @module @lynk-protocol/react
+ * @module {% package %}
  */
 
 export * from './provider';
-export * from './useLynk';
+export * from './use{% name %}';
 export * from './types';
 export * from './utils/storage';
 export * from './utils/reconnect';
@@ -606,7 +670,114 @@ export * from './utils/reconnect';
 # [3. GENERATION ENGINE]
 # ==============================================================================
 
-# Structure: (Message, List[(FilePath, Content)])
+class Asset:
+    # Binary content streamed from a file on disk (or a byte range of one, such as a blob inside a plan): mapped
+    # with mmap, then hashed and written ASSET_CHUNK bytes at a time, never held in memory whole.
+    # A relative source is looked up in ASSET_DIR; an optional asset whose source is missing is left out.
+    __slots__ = ("source", "offset", "size", "optional", "_sha")
+
+    def __init__(self, source, offset=0, size=None, sha=None, optional=False):
+        self.source = source
+        self.offset = offset
+        self.size = size
+        self.optional = optional
+        self._sha = sha
+
+    def path(self):
+        return self.source if os.path.isabs(self.source) else os.path.join(ASSET_DIR, self.source)
+
+    def exists(self):
+        return os.path.isfile(self.path())
+
+    def length(self):
+        if self.size is None:
+            self.size = os.path.getsize(self.path()) - self.offset
+        return self.size
+
+    def chunks(self):
+        end = self.offset + self.length()
+        if end == self.offset: return
+        with open(self.path(), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(self.offset, end, ASSET_CHUNK):
+                    with view[start:min(start + ASSET_CHUNK, end)] as chunk:
+                        yield chunk
+            finally:
+                view.release()
+
+    @property
+    def sha(self):
+        if self._sha is None:
+            digest = hashlib.sha1(b"blob %d\0" % self.length())
+            for chunk in self.chunks():
+                digest.update(chunk)
+            self._sha = digest.digest()
+        return self._sha
+
+class Template:
+    # A CONTENT_* text compiled once into a str.format pattern. Slots are written "{% name %}", which cannot clash
+    # with the braces of JSX props, object literals or `${}` strings in the sources; those are escaped instead.
+    SLOT = re.compile(r"\{%\s*(\w+)\s*%\}")
+    _compiled = {} # source text -> Template
+
+    __slots__ = ("pattern", "names")
+
+    def __init__(self, text):
+        pieces = self.SLOT.split(text) # literal, slot name, literal, ...
+        self.names = frozenset(pieces[1::2])
+        self.pattern = "".join("{%s}" % piece if i % 2 else piece.replace("{", "{{").replace("}", "}}")
+                               for i, piece in enumerate(pieces))
+
+    @classmethod
+    def get(cls, text):
+        template = cls._compiled.get(text)
+        if template is None:
+            template = cls._compiled[text] = cls(text)
+        return template
+
+    def render(self, values):
+        try:
+            return self.pattern.format_map(values)
+        except KeyError as e:
+            raise SystemExit(f"[!] Template variable {e} is not set; add it to TEMPLATE_VARS")
+
+class TemplateRef:
+    # A TASKS content rendered per repository: a template plus variables for this one change (e.g. a version bump)
+    __slots__ = ("text", "overrides")
+
+    def __init__(self, text, **overrides):
+        self.text = text
+        self.overrides = overrides
+
+def template_values():
+    # Defaults follow PROJECT_NAME and the identity, so a variant only has to set what differs
+    values = {
+        "slug": PROJECT_NAME, "name": PROJECT_NAME.capitalize(), "title": PROJECT_NAME.upper(),
+        "package": f"@{PROJECT_NAME}-protocol/react", "version": "1.0.4", "author": f"{PROJECT_NAME.upper()} Labs",
+        "repo": f"{USER_NAME}/{PROJECT_NAME}", "banner": BANNER_PATH, "note": "",
+    }
+    values.update(TEMPLATE_VARS)
+    return values
+
+def render(content, values):
+    if isinstance(content, Asset):
+        return content
+    if isinstance(content, TemplateRef):
+        return Template.get(content.text).render({**values, **content.overrides})
+    return Template.get(content).render(values)
+
+def rendered_tasks():
+    # TASKS with every message, path and content rendered for the configured repository
+    values = template_values()
+    return [(render(msg, values), [(posixpath.normpath(render(f_path, values)), render(f_content, values))
+                                   for f_path, f_content in changes
+                                   if not (isinstance(f_content, Asset) and f_content.optional and not f_content.exists())])
+            for msg, changes in TASKS]
+
+# Structure: (Message, List[(FilePath, Content)]); paths and contents are templates, rendered per repository.
+# Content may also be an Asset: binary files committed like any other change, e.g. a new banner version as
+# ("design: refresh banner", [("{% banner %}", Asset("lynk-v2.png"))])
 TASKS = [
     # PHASE 1: INIT & CONFIG
     ("init: scaffold monorepo structure", [
@@ -614,7 +785,8 @@ TASKS = [
         ("package.json", CONTENT_PACKAGE_JSON), 
         ("tsconfig.json", CONTENT_TSCONFIG),
         (".gitignore", "node_modules\ndist\n.DS_Store\ncoverage\n.env\n"),
-        (".npmignore", "src\ntsconfig.json\n")
+        (".npmignore", "src\ntsconfig.json\n"),
+        ("{% banner %}", Asset("lynk.png", optional=True))
     ]),
     
     # PHASE 2: CORE TYPES & UTILS
@@ -633,7 +805,7 @@ TASKS = [
         ("src/provider.tsx", CONTENT_PROVIDER_TSX)
     ]),
     ("feat(hooks): implement useLynk hook", [
-        ("src/useLynk.ts", CONTENT_HOOK_TS)
+        ("src/use{% name %}.ts", CONTENT_HOOK_TS)
     ]),
     ("feat(entry): export public API barrel file", [
         ("src/index.ts", CONTENT_INDEX_TS)
@@ -644,22 +816,31 @@ TASKS = [
         ("README.md", CONTENT_README)
     ]),
     ("fix(types): export ReconnectStrategy enum", [
-        ("src/types.ts", CONTENT_TYPES_TS + "\n// Exported for consumers")
+        ("src/types.ts", TemplateRef(CONTENT_TYPES_TS, note="\n// Exported for consumers"))
     ]),
     ("refactor(provider): optimize session check on mount", [
-        ("src/provider.tsx", CONTENT_PROVIDER_TSX + "\n// Optimized effect dependencies")
+        ("src/provider.tsx", TemplateRef(CONTENT_PROVIDER_TSX, note="\n// Optimized effect dependencies"))
     ]),
     ("chore: bump version 1.0.1", [
-        ("package.json", CONTENT_PACKAGE_JSON.replace("1.0.4", "1.0.1"))
+        ("package.json", TemplateRef(CONTENT_PACKAGE_JSON, version="1.0.1"))
     ]),
     ("ci: add github actions workflow", [
         (".github/workflows/main.yml", "name: CI\non: [push]\njobs:\n  build:\n    runs-on: ubuntu-latest\n    steps:\n      - uses: actions/checkout@v2\n      - uses: actions/setup-node@v2\n      - run: npm install\n      - run: npm run build")
     ]),
-    ("chore: release v1.0.4", [
+    ("chore: release v{% version %}", [
         ("package.json", CONTENT_PACKAGE_JSON)
     ])
 ]
 
+# Phases developed on feature/<name> branches when BRANCHES is on: a TASKS commit touching only these paths (templates,
+# like the TASKS paths) opens or joins that phase's branch
+BRANCH_FEATURES = {
+    "types": ["src/types.ts"],
+    "storage": ["src/utils/storage.ts"],
+    "reconnect": ["src/utils/reconnect.ts"],
+    "provider": ["src/provider.tsx", "src/use{% name %}.ts"],
+}
+
 # Filler Logs for Density
 FILLER_LOGS = [
     "fix(hook): hydration mismatch error in next.js",
@@ -681,68 +862,2688 @@ FILLER_LOGS = [
     "fix(reconnect): cap max delay at 5s"
 ]
 
+# ------------------------------------------------------------------------------
+# Instrumentation: every event is a dict handed to each callable in HOOKS
+# ------------------------------------------------------------------------------
+HOOKS = []
+
+def emit(event, **fields):
+    if not HOOKS: return
+    fields["event"] = event
+    fields["t"] = time.time()
+    for hook in HOOKS:
+        hook(fields)
+
+class ProgressDisplay:
+    # Prints at most one commit line per PROGRESS_INTERVAL (plus the last one) and every failed git call
+    def __init__(self, interval=PROGRESS_INTERVAL):
+        self.interval = interval
+        self.last = 0.0
+        self.first = None
+        self.started = time.perf_counter()
+
+    def __call__(self, event):
+        if event["event"] == "commit":
+            if self.first is None: self.first = event["index"]
+            now = time.perf_counter()
+            if now - self.last >= self.interval or event["index"] + 1 == event["total"]:
+                self.last = now
+                rate = (event["index"] + 1 - self.first) / max(now - self.started, 1e-9)
+                print(f"[{event['index']+1}/{event['total']}] {event['ts']} - {event['msg']} ({rate:.0f} commits/s)")
+        elif event["event"] == "git" and event["returncode"] and not event.get("query"):
+            print(f"[!] {' '.join(event['args'])} exited with {event['returncode']}: {event['stderr'].strip()}")
+
+class EventLog:
+    def __init__(self, path):
+        self.f = open(path, "a", encoding='utf-8')
+
+    def __call__(self, event):
+        self.f.write(json.dumps(event, default=str) + "\n")
+
+    def close(self):
+        self.f.close()
+
 def run_git(args, env=None):
-    subprocess.run(args, cwd=REPO_DIR, env=env, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    import subprocess # Deferred, like every import only some commands need, to keep CLI startup short
+    started = time.perf_counter()
+    proc = subprocess.run(args, cwd=REPO_DIR, env=env, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    emit("git", args=args, returncode=proc.returncode, stderr=proc.stderr.decode('utf-8', 'replace'),
+         seconds=time.perf_counter() - started)
+    return proc.returncode
+
+def read_git(args):
+    import subprocess
+    started = time.perf_counter()
+    proc = subprocess.run(args, cwd=REPO_DIR, check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    emit("git", args=args, returncode=proc.returncode, stderr=proc.stderr, seconds=time.perf_counter() - started, query=True)
+    return proc.stdout.strip()
 
 def create_file(path, content):
+    started = time.perf_counter()
     full_path = os.path.join(REPO_DIR, path)
     if os.path.dirname(full_path):
         os.makedirs(os.path.dirname(full_path), exist_ok=True)
-    with open(full_path, "w", encoding='utf-8') as f:
-        f.write(content)
+    if isinstance(content, Asset):
+        with open(full_path, "wb") as f:
+            for chunk in content.chunks():
+                f.write(chunk)
+    elif isinstance(content, bytes):
+        with open(full_path, "wb") as f:
+            f.write(content)
+    else:
+        with open(full_path, "w", encoding='utf-8') as f:
+            f.write(content)
+    size = content.length() if isinstance(content, Asset) else len(content)
+    emit("create_file", path=path, chars=size, seconds=time.perf_counter() - started)
+
+# Wall time per pipeline phase: "timeline", "materialize" (content hashing, working tree, index),
+# "stage" (blob storage: git add / blob stream / pack entries) and "commit" (trees, commits, pack sealing)
+PHASE_TIMES = {}
+
+@contextmanager
+def phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_TIMES[name] = PHASE_TIMES.get(name, 0.0) + time.perf_counter() - started
+
+def timed(iterable, name):
+    # Times every step of a lazy iterator into PHASE_TIMES[name] and reports it as a `name` event
+    it = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            return
+        finally:
+            elapsed = time.perf_counter() - started
+            PHASE_TIMES[name] = PHASE_TIMES.get(name, 0.0) + elapsed
+        emit(name, value=item, seconds=elapsed)
+        yield item
+
+def progress(i, ts, msg):
+    emit("commit", index=i, total=TARGET_COMMITS, ts=ts, msg=msg.partition("\n")[0]) # Subject line of merge commits
+
+def git_date(dt):
+    # Naive datetimes are local wall-clock time, the same way `git commit --date` reads them
+    aware = dt.astimezone() if dt.tzinfo is None else dt
+    minutes = int(aware.utcoffset().total_seconds()) // 60
+    sign = "+" if minutes >= 0 else "-"
+    return f"{int(aware.timestamp())} {sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+OBJ_COMMIT, OBJ_TREE, OBJ_BLOB, OBJ_OFS_DELTA = 1, 2, 3, 6
+TYPE_NAMES = {OBJ_COMMIT: b"commit", OBJ_TREE: b"tree", OBJ_BLOB: b"blob"}
+
+def object_id(obj_type, data):
+    return hashlib.sha1(b"%s %d\0" % (TYPE_NAMES[obj_type], len(data)) + data).digest()
+
+class Blob:
+    # Content whose blob id is already known (read back from a plan), so it is never encoded or hashed again
+    __slots__ = ("sha", "data")
+
+    def __init__(self, sha, data):
+        self.sha = sha
+        self.data = data
+
+class BlobStore:
+    # Interns file contents by git blob id, so each distinct string is encoded, hashed and compressed once
+    def __init__(self, limit=BLOB_CACHE_BYTES):
+        self.limit = limit
+        self.size = 0
+        self.shas = OrderedDict() # content (or the id of a prehashed Blob) -> blob sha, in LRU order
+        self.data = {} # blob sha -> raw bytes
+        self.packed = {} # blob sha -> zlib stream
+        self.assets = {} # blob sha -> Asset, streamed from disk whenever needed and never cached
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, content):
+        if isinstance(content, Asset):
+            self.assets[content.sha] = content
+            return content.sha
+        key = content.sha if isinstance(content, Blob) else content
+        sha = self.shas.get(key)
+        if sha is not None:
+            self.hits += 1
+            self.shas.move_to_end(key)
+            return sha
+        self.misses += 1
+        if isinstance(content, Blob):
+            sha, data = content.sha, content.data
+        else:
+            data = content.encode('utf-8')
+            sha = object_id(OBJ_BLOB, data)
+        self.shas[key] = sha
+        self.data[sha] = data
+        self.size += len(data)
+        # Evict cold contents; one-off versions (README growth) should not pin memory
+        while self.size > self.limit and len(self.shas) > 1:
+            _, old = self.shas.popitem(last=False)
+            self.size -= len(self.data.pop(old)) + len(self.packed.pop(old, b""))
+        return sha
+
+    def content(self, sha):
+        # Raw bytes of a cached blob, or the Asset to stream it from
+        data = self.data.get(sha)
+        return self.assets[sha] if data is None else data
+
+    def compressed(self, sha):
+        packed = self.packed.get(sha)
+        if packed is None:
+            packed = self.packed[sha] = zlib.compress(self.data[sha])
+            self.size += len(packed)
+        return packed
+
+    def report(self):
+        emit("blob_store", hits=self.hits, misses=self.misses, cached=len(self.data), bytes=self.size)
+        if VERBOSE: print(f"[*] BLOB STORE: {self.hits} hits / {self.misses} misses ({len(self.data)} blobs cached, {self.size >> 10} KiB)")
+
+def working_hours(ts_dt):
+    # Ensure consistent working hours (09:00 ~ 02:00): 03:00-08:59 is squeezed into 09:00-09:59 in order
+    if 2 < ts_dt.hour < 9:
+        night = ts_dt - ts_dt.replace(hour=3, minute=0, second=0, microsecond=0)
+        ts_dt = ts_dt.replace(hour=9, minute=0, second=0, microsecond=0) + night / 6
+    return ts_dt
+
+def timeline_seed():
+    # Drawn from the run's generator once per timeline, right after seeding, to seed the timeline's own one. A
+    # timeline drawn up front (numpy) then leaves the filler and branch draws exactly where the stream leaves them.
+    return random.getrandbits(64)
+
+def iter_timestamps(seed, first=0, last=None):
+    # Yields TARGET_COMMITS timestamps already in order, one slot at a time, in O(1) memory.
+    # `first`/`last` continue an interrupted timeline from a journal checkpoint. Jitter comes from its own
+    # generator (`seed`, see timeline_seed), so slot i gets the same draw whatever fillers and branches draw.
+    step = (END_DATE - START_DATE).total_seconds() / TARGET_COMMITS
+    rng = random.Random(seed)
+    for _ in range(first): rng.random() # One draw per slot already committed
+
+    for i in range(first, TARGET_COMMITS):
+        base_time = START_DATE + timedelta(seconds=i*step)
+        # Jitter stays within +-20% of the slot, so neighbouring slots can never swap
+        jitter = rng.uniform(-0.2 * step, 0.2 * step)
+        final_time = working_hours(base_time + timedelta(seconds=jitter))
+        # A squeezed commit may still land after the next regular one; hold it back instead of sorting
+        if last is not None and final_time < last:
+            final_time = last
+        last = final_time
+        yield final_time
+
+def _microseconds(np, seconds):
+    # timedelta(seconds=x) for an array of floats: whole seconds plus the fraction rounded half-even to microseconds
+    whole = np.trunc(seconds)
+    return whole.astype(np.int64) * 10**6 + np.round((seconds - whole) * 1e6).astype(np.int64)
+
+def numpy_timeline(seed, first=0):
+    # Timestamps first..TARGET_COMMITS as int64 wall-clock microseconds since 1970-01-01 (in TZ_OFFSET_MINUTES, or
+    # the zone of START_DATE), in a few vectorized passes. With uniform WEEKDAY_WEIGHTS and no bursts it is
+    # iter_timestamps() exactly: the same jitter draws from the timeline's own generator and the same timedelta
+    # arithmetic, so a whole run (and a resumed one) commits the same history with either timeline.
+    try:
+        import numpy as np # Optional and slow to import, so only this timeline loads it
+    except ImportError:
+        raise SystemExit("[!] TIMELINE_ENGINE = \"numpy\" requires numpy (pip install numpy)")
+    n = TARGET_COMMITS
+    wall = START_DATE.replace(tzinfo=None)
+    origin = (wall - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+    span = (END_DATE - START_DATE).total_seconds()
+    day, hour = 86400 * 10**6, 3600 * 10**6
+    weights = np.asarray(WEEKDAY_WEIGHTS, dtype=np.float64)
+
+    if np.all(weights == weights[0]) and BURST_PROBABILITY <= 0:
+        # 1. START_DATE + slot + jitter, each step rounded to microseconds like the timedelta objects it mirrors
+        step = span / n
+        rng = random.Random(seed)
+        jitter = np.array([rng.uniform(-0.2 * step, 0.2 * step) for _ in range(n)][first:], dtype=np.float64)
+        t = origin + _microseconds(np, np.arange(first, n, dtype=np.float64) * step) + _microseconds(np, jitter)
+        # 2. Working hours: 03:00-08:59 is squeezed into 09:00-09:59, dividing like timedelta (half-even)
+        sod = np.mod(t, day)
+        night = (sod >= 3 * hour) & (sod < 9 * hour)
+        q, r = np.divmod(sod - 3 * hour, 6)
+        q += (2 * r > 6) | ((2 * r == 6) & (q % 2 == 1))
+        t = np.where(night, t - sod + 9 * hour + q, t)
+        # 3. Hold back out-of-order commits instead of sorting
+        return np.maximum.accumulate(t) if len(t) else t
+
+    rng = np.random.default_rng(seed)
+    if TZ_OFFSET_MINUTES is not None:
+        offset = TZ_OFFSET_MINUTES * 60
+    else:
+        offset = int((START_DATE.utcoffset() or START_DATE.astimezone().utcoffset()).total_seconds())
+    start = wall.replace(tzinfo=timezone(timedelta(seconds=offset))).timestamp()
+
+    # 1. Slot positions with +-20% jitter, in units of slots
+    u = np.arange(n) + rng.uniform(-0.2, 0.2, n)
+
+    # 2. Map slots to time through the inverse CDF of a per-day activity density
+    if np.all(weights == weights[0]):
+        t = start + u * (span / n)
+    else:
+        first_day = (start + offset) // 86400 * 86400 - offset
+        edges = np.arange(first_day, start + span + 86400, 86400)
+        edges = np.clip(edges, start, start + span)
+        # 1970-01-01 was a Thursday (weekday 3)
+        weekday = ((edges[:-1] + offset) // 86400 + 3).astype(np.int64) % 7
+        mass = weights[weekday] * np.diff(edges)
+        cdf = np.concatenate(([0.0], np.cumsum(mass)))
+        target = u / n * cdf[-1]
+        day_index = np.clip(np.searchsorted(cdf, target, side="right") - 1, 0, len(mass) - 1)
+        density = np.where(mass[day_index] > 0, mass[day_index] / np.maximum(np.diff(edges)[day_index], 1), 1)
+        t = edges[day_index] + (target - cdf[day_index]) / density
+
+    # 3. Bursts: a flagged commit follows its anchor (the last unflagged one) by exponential gaps
+    if BURST_PROBABILITY > 0:
+        idx = np.arange(n)
+        burst = rng.random(n) < BURST_PROBABILITY
+        burst[0] = False
+        anchor = np.maximum.accumulate(np.where(burst, 0, idx))
+        gaps = np.cumsum(np.where(burst, rng.exponential(BURST_GAP_SECONDS, n), 0.0))
+        t = np.where(burst, t[anchor] + gaps - gaps[anchor], t)
+
+    # 4. Ensure consistent working hours (09:00 ~ 02:00): 03:00-08:59 local is squeezed into 09:00-09:59
+    local = t + offset
+    sod = np.mod(local, 86400)
+    night = (sod >= 3 * 3600) & (sod < 9 * 3600)
+    local = np.where(night, local - sod + 9 * 3600 + (sod - 3 * 3600) / 6, local)
+
+    # 5. Hold back out-of-order commits instead of sorting, as the stream timeline does; whole seconds
+    return (np.floor(np.maximum.accumulate(local)).astype(np.int64) * 10**6)[first:]
+
+def iter_numpy_timestamps(seed, first=0, last=None):
+    wall = numpy_timeline(seed, first)
+    # Naive wall-clock datetimes when following START_DATE's zone, fixed-offset aware ones otherwise
+    tz = START_DATE.tzinfo if TZ_OFFSET_MINUTES is None else timezone(timedelta(minutes=TZ_OFFSET_MINUTES))
+    origin = datetime(1970, 1, 1, tzinfo=tz)
+    for chunk_start in range(0, len(wall), 65536):
+        for us in wall[chunk_start:chunk_start + 65536].tolist():
+            ts_dt = origin + timedelta(microseconds=us)
+            # Without a SEED a resumed tail is drawn afresh, so keep it behind the last committed timestamp
+            if last is not None and ts_dt < last: ts_dt = last
+            yield ts_dt
+
+def check_target():
+    # Every timeline spreads TARGET_COMMITS slots over START_DATE..END_DATE, so an empty run is refused up front
+    if TARGET_COMMITS < 1:
+        raise SystemExit(f"[!] TARGET_COMMITS must be at least 1, got {TARGET_COMMITS}.")
+
+TIMELINES = {
+    "stream": iter_timestamps,
+    "numpy": iter_numpy_timestamps,
+}
 
-if __name__ == "__main__":
-    print(f"[*] INITIALIZING LYNK PROTOCOL (UNBREAKABLE WALLET ADAPTER)...")
-    print(f"[*] USER: {USER_NAME} <{USER_EMAIL}>")
-    print(f"[*] DATE RANGE: {START_DATE.strftime('%Y-%m-%d')} ~ {END_DATE.strftime('%Y-%m-%d')}")
-    
-    # 1. Init
+def new_state():
+    # Everything needed to continue the commit loop: timeline position, TASKS progress and file contents
+    # (or, when applying a plan, the plan file and the position in it), plus blobs borrowed from SHARED_STORE
+    return {"index": 0, "task_idx": 0, "fillers": 0, "files": {}, "last_ts": None, "sha": None, "plan": None,
+            "shared": set(), "churn": {}, "branch": None, "merges": 0, "timeline_seed": None}
+
+# Comment lines the "churn" filler adds to, rewrites in and removes from the TypeScript sources
+CHURN_NOTES = [
+    "TODO: surface this error to the caller instead of logging it",
+    "NOTE: keep in sync with the storage prefix in types.ts",
+    "perf: avoid a re-render when the wallet did not change",
+    "FIXME: race with adapter injection on slow devices",
+    "NOTE: adapters may reject before the first heartbeat",
+    "TODO: make the retry budget configurable",
+    "keep the session check cheap; it runs on every mount",
+    "guard against undefined window in SSR builds",
+    "TODO: add a unit test for this branch",
+    "NOTE: order matters here, see the state machine in the README",
+    "perf: memoize derived values before passing them down",
+    "HACK: some wallets emit connect twice",
+]
+# Statement starts a comment can safely go above (never inside JSX, strings or object literals)
+CHURN_ANCHORS = ("const ", "let ", "if (", "return ", "await ", "export ", "try {", "for (", "throw ")
+CHURN_MAX_NOTES = 12 # Added comment lines per file before churn starts removing them
+CHURN_RUN = 4 # Consecutive churn commits on the same file, so each blob is a small delta of the previous one
+_CHURN_LINES = frozenset("// " + note for note in CHURN_NOTES)
+
+class ChurnFile:
+    # A source kept as an editable line array, plus the positions of the comment lines churn added. Edits touch
+    # only the lines involved; `text` is the version last handed out, to tell when a task rewrote the file.
+    __slots__ = ("lines", "marks", "text", "anchored")
+
+    def __init__(self, text):
+        self.lines = text.splitlines(keepends=True)
+        self.marks = [i for i, line in enumerate(self.lines) if line.strip() in _CHURN_LINES]
+        self.text = text
+        # Comments only go in front of statements, so a source without one can only lose the ones it has
+        self.anchored = any(line.lstrip().startswith(CHURN_ANCHORS) for line in self.lines)
+
+    def _anchor(self, start):
+        # First statement start at or after `start`, wrapping around
+        n = len(self.lines)
+        for step in range(n):
+            i = (start + step) % n
+            if self.lines[i].lstrip().startswith(CHURN_ANCHORS):
+                return i
+        return None
+
+    def add(self, note):
+        pos = self._anchor(random.randrange(len(self.lines)))
+        if pos is None: return False
+        line = self.lines[pos]
+        indent = line[:len(line) - len(line.lstrip())]
+        self.lines.insert(pos, f"{indent}// {note}\n")
+        self.marks = [m + 1 if m >= pos else m for m in self.marks]
+        self.marks.append(pos)
+        self.marks.sort()
+        return True
+
+    def rewrite(self, note):
+        pos = random.choice(self.marks)
+        line = self.lines[pos]
+        if line.strip() == "// " + note: return False
+        indent = line[:len(line) - len(line.lstrip())]
+        self.lines[pos] = f"{indent}// {note}\n"
+        return True
+
+    def drop(self):
+        pos = self.marks.pop(random.randrange(len(self.marks)))
+        del self.lines[pos]
+        self.marks = [m - 1 if m > pos else m for m in self.marks]
+        return True
+
+def churn_change(state):
+    # One small edit to a TypeScript source: add, rewrite or drop a comment line. None when no source can be
+    # edited (none has a statement to comment or a churn comment to drop).
+    files = state["files"]
+    sources = []
+    for path in sorted(p for p in files if p.endswith((".ts", ".tsx")) and isinstance(files[p], str)):
+        churn = state["churn"].get(path)
+        if churn is None or churn.text is not files[path]:
+            churn = state["churn"][path] = ChurnFile(files[path])
+        if churn.anchored or churn.marks: sources.append(path)
+    if not sources: return None
+    path = sources[(state["fillers"] - 1) // CHURN_RUN % len(sources)]
+    churn = state["churn"][path]
+    for _ in range(16): # A rewrite can draw the note already there; bounded in case every edit keeps failing
+        roll = random.random()
+        if not churn.marks: changed = churn.add(random.choice(CHURN_NOTES))
+        elif len(churn.marks) >= CHURN_MAX_NOTES: changed = churn.drop() if roll < 0.6 else churn.rewrite(random.choice(CHURN_NOTES))
+        elif roll < 0.5 and churn.anchored: changed = churn.add(random.choice(CHURN_NOTES))
+        elif roll < 0.8: changed = churn.rewrite(random.choice(CHURN_NOTES))
+        else: changed = churn.drop()
+        if changed: break
+    else:
+        return None
+    churn.text = "".join(churn.lines)
+    return path, churn.text
+
+def filler_change(state, msg):
+    files = state["files"]
+    n = state["fillers"]
+    state["fillers"] += 1
+    if FILLER_MODE == "readme":
+        # Append newline to README to simulate activity without breaking code
+        return "README.md", files.get("README.md", "") + "\n"
+    if FILLER_MODE == "churn":
+        change = churn_change(state)
+        if change: return change
+
+    # Consecutive fillers share a file before moving to the next one, so each version is a small delta of the
+    # previous blob (fast-import deltas against the last blob it stored); the serial keeps versions distinct
+    run = max(1, FILLER_FILE_BUDGET // 128)
+    path = f"{FILLER_DIR}/note-{n // run % FILLER_FILES:02d}.md"
+    line = f"- {msg} (#{n + 1})\n"
+    text = files.get(path, "") + line
+    if len(text) > FILLER_FILE_BUDGET:
+        # Drop the oldest lines past the budget, so a filler blob never outgrows it
+        cut = text.find("\n", len(text) - FILLER_FILE_BUDGET - 1) + 1
+        text = text[cut:] if cut < len(text) else line
+    return path, text
+
+def project_git_size():
+    # Upper bound for .git as loose zlib objects (packs delta-compress further), computed before the run. Object ids
+    # are placeholders as incompressible as real ones, so trees and commits are not underestimated.
+    fillers = max(0, TARGET_COMMITS - len(TASKS))
+    paths, contents = set(), set()
+    tasks = rendered_tasks()
+    for _, changes in tasks:
+        for f_path, f_content in changes:
+            paths.add(f_path)
+            contents.add(f_content)
+    ids = (hashlib.sha1(str(i).encode()).digest() for i in itertools.count())
+
+    def loose(obj_type, body):
+        # git stores loose objects at core.looseCompression, which defaults to level 1
+        return len(zlib.compress(b"%s %d\0%s" % (TYPE_NAMES[obj_type], len(body), body), 1))
+
+    def tree(names):
+        return loose(OBJ_TREE, b"".join(b"100644 %s\0%s" % (n.encode('utf-8'), next(ids)) for n in sorted(names)))
+
+    total = sum(c.length() if isinstance(c, Asset) else loose(OBJ_BLOB, c.encode('utf-8')) for c in contents)
+    ident = f"{USER_NAME} <{USER_EMAIL}> 1765792361 +0000".encode('utf-8')
+    commit = loose(OBJ_COMMIT, b"tree %s\nparent %s\nauthor %s\ncommitter %s\n\n%s\n" % (
+        next(ids).hex().encode(), next(ids).hex().encode(), ident, ident, max(FILLER_LOGS, key=len).encode('utf-8')))
+    root = {p.split("/")[0] for p in paths}
+    if FILLER_MODE == "readme":
+        readme = dict(tasks[0][1])["README.md"]
+        blob = loose(OBJ_BLOB, readme.encode('utf-8') + b"\n" * fillers) # One new README per filler
+        trees = tree(root)
+    elif FILLER_MODE == "churn":
+        # One new version of the largest source per filler, plus every tree on its path
+        sources = [c for _, changes in tasks for p, c in changes if p.endswith((".ts", ".tsx")) and isinstance(c, str)]
+        blob = loose(OBJ_BLOB, (max(sources, key=len, default="") + "".join(
+            f"// {CHURN_NOTES[i % len(CHURN_NOTES)]}\n" for i in range(CHURN_MAX_NOTES))).encode('utf-8'))
+        trees = 3 * tree(paths)
+    else:
+        sample = "".join(f"- {FILLER_LOGS[i % len(FILLER_LOGS)]} (#{i})\n" for i in range(FILLER_FILE_BUDGET // 32))
+        blob = loose(OBJ_BLOB, sample[-FILLER_FILE_BUDGET:].encode('utf-8'))
+        trees = tree(root | {FILLER_DIR}) + tree(f"note-{i:02d}.md" for i in range(FILLER_FILES))
+    return total + len(TASKS) * (commit + trees) + fillers * (blob + trees + commit)
+
+def iter_commits(timestamps, state):
+    # Yields (datetime, message, [(path, content)]) for the whole timeline, tracking file state in `state`
+    files = state["files"]
+    tasks = rendered_tasks()
+    for ts_dt in timestamps:
+        # Logic to choose between Task or Filler
+        if state["task_idx"] < len(tasks):
+            msg, changes = tasks[state["task_idx"]] # Unpacking is now safe due to strict structure
+            state["task_idx"] += 1
+        else:
+            msg = random.choice(FILLER_LOGS)
+            changes = [filler_change(state, msg)]
+        for f_path, f_content in changes:
+            files[f_path] = f_content
+        state["index"] += 1
+        state["last_ts"] = ts_dt
+        yield ts_dt, msg, changes
+
+def branch_commits(commits, state):
+    # Spreads a linear commit stream over short-lived branches. Yields (datetime, message, changes, ref, merged):
+    # ref is the branch the commit lands on; a merge commit (merged = the branch, ref = main) carries the merged
+    # branch's version of every path it changed. One branch is open at a time and, while it is, main and the branch
+    # never change the same path, so that version laid over main's tree is exactly the tree a three-way merge would
+    # give, without a checkout. Commits keep their messages, timestamps and contents; only the branch they land on
+    # changes, and merge commits are added between them.
+    values = template_values()
+    features = {posixpath.normpath(render(p, values)): name for name, paths in BRANCH_FEATURES.items() for p in paths}
+    task_messages = {msg for msg, _ in rendered_tasks()}
+    branch = None # name, feature, title, commits left, {path: content} of the branch
+    touched = set() # Paths main changed since the open branch forked
+    last_ts = state["last_ts"]
+    started = bool(state["sha"]) # A branch needs a main commit to fork from
+
+    def merge(ts_dt):
+        state["merges"] += 1
+        state["branch"] = branch["name"]
+        msg = f"Merge pull request #{state['merges']} from {USER_NAME}/{branch['name']}\n\n{branch['title']}"
+        return ts_dt, msg, list(branch["changes"].items()), "main", branch["name"]
+
+    for ts_dt, msg, changes in commits:
+        paths = {f_path for f_path, _ in changes}
+        owners = {features.get(f_path) for f_path in paths}
+        feature = owners.pop() if msg in task_messages and len(owners) == 1 else None
+        if branch:
+            mine = paths & branch["changes"].keys()
+            if not branch["left"] or (mine and paths & touched) or (feature and feature != branch["feature"] and not mine):
+                # Done, or this commit needs both lines: merged somewhere between the previous commit and this one,
+                # in working hours like every other commit
+                gap = (ts_dt - last_ts).total_seconds() * random.uniform(0.2, 0.8)
+                merged_ts = working_hours(last_ts + timedelta(seconds=int(gap)))
+                yield merge(min(max(merged_ts, last_ts), ts_dt))
+                branch = None
+        if not branch and started and (feature or random.random() < BRANCH_PROBABILITY):
+            match = re.match(r"(\w+)(?:\(([^)]*)\))?", msg)
+            kind, scope = match.groups() if match else ("topic", None)
+            name = f"feature/{feature}" if feature else f"{kind}/{scope or 'misc'}-{state['merges'] + 1}"
+            branch = {"name": name, "feature": feature, "title": msg, "left": random.randint(1, BRANCH_COMMITS),
+                      "changes": {}}
+            touched = set()
+        ref = "main"
+        if branch:
+            mine = paths & branch["changes"].keys()
+            if not branch["changes"] or mine or (not paths & touched and (
+                    (feature and feature == branch["feature"]) or random.random() < 0.5)):
+                ref = branch["name"]
+                branch["changes"].update(changes)
+                branch["left"] -= 1
+            else:
+                touched |= paths
+        state["branch"] = branch and branch["name"]
+        yield ts_dt, msg, changes, ref, None
+        started = True
+        last_ts = ts_dt
+    if branch:
+        # Shortly after the last commit, but never past END_DATE (in the timestamps' zone when they carry one)
+        end = END_DATE
+        if (end.tzinfo is None) != (last_ts.tzinfo is None): end = end.replace(tzinfo=last_ts.tzinfo)
+        ts_dt = working_hours(last_ts + timedelta(seconds=random.randint(300, 3600)))
+        ts_dt = max(last_ts, min(ts_dt, end))
+        yield merge(ts_dt)
+        state["branch"], state["last_ts"] = None, ts_dt
+
+def journal_path():
+    return os.path.join(REPO_DIR, ".git", JOURNAL_NAME)
+
+def write_journal(state, done=False):
+    # Atomic replace + fsync, so a crash leaves either the previous checkpoint or this one
+    rng = random.getstate()
+    record = {
+        "index": state["index"], "task_idx": state["task_idx"], "fillers": state["fillers"], "merges": state["merges"],
+        # A plan run rebuilds its file contents from the plan itself
+        "files": {} if state["plan"] else encode_files(state["files"]), "plan": state["plan"], "sha": state["sha"],
+        "last_ts": state["last_ts"].isoformat() if state["last_ts"] else None,
+        "rng": [rng[0], list(rng[1]), rng[2]], "timeline_seed": state["timeline_seed"], "done": done,
+        "run": {"start_date": START_DATE.isoformat(), "end_date": END_DATE.isoformat(), "target_commits": TARGET_COMMITS,
+                "engine": ENGINE, "timeline_engine": TIMELINE_ENGINE, "seed": SEED, "branches": BRANCHES},
+    }
+    path = journal_path()
+    with open(path + ".tmp", "w", encoding='utf-8') as f:
+        json.dump(record, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+def encode_files(files):
+    # Assets are journaled by reference, not content
+    return {p: {"asset": c.source, "offset": c.offset, "size": c.length(), "sha": c.sha.hex()} if isinstance(c, Asset)
+            else c for p, c in files.items()}
+
+def decode_files(files):
+    return {p: Asset(c["asset"], c["offset"], c["size"], bytes.fromhex(c["sha"])) if isinstance(c, dict) else c
+            for p, c in files.items()}
+
+def read_journal():
+    path = journal_path()
+    if not os.path.exists(path):
+        raise SystemExit(f"[!] No journal at {path}; nothing to resume or append to.")
+    with open(path, encoding='utf-8') as f:
+        record = json.load(f)
+    if record["last_ts"]: record["last_ts"] = datetime.fromisoformat(record["last_ts"])
+    record["files"] = decode_files(record["files"])
+    rng = record["rng"]
+    record["rng"] = (rng[0], tuple(rng[1]), rng[2])
+    return record
+
+def checkpoint_due(state):
+    # Never while a branch is open: the journal only records main, so a resume could not bring the branch back
+    return CHECKPOINT_EVERY and state["index"] % CHECKPOINT_EVERY == 0 and not state["branch"]
+
+def commit_subprocess(commits, state):
+    store = BlobStore()
+    written = {p: store.intern(c) for p, c in state["files"].items()} # path -> blob sha currently on disk
+
+    for ts_dt, msg, changes in commits:
+        ts = ts_dt.strftime('%Y-%m-%d %H:%M:%S')
+        date = git_date(ts_dt)
+        env = os.environ.copy()
+        env["GIT_AUTHOR_DATE"] = date
+        env["GIT_COMMITTER_DATE"] = date
+
+        # Unchanged paths are neither rewritten nor restaged; with nothing changed `git commit` would be a no-op
+        changed = []
+        with phase("materialize"):
+            for f_path, f_content in changes:
+                sha = store.intern(f_content)
+                if written.get(f_path) != sha:
+                    create_file(f_path, store.content(sha))
+                    written[f_path] = sha
+                    changed.append(f_path)
+
+        if changed:
+            with phase("stage"):
+                run_git(["git", "add", "--"] + changed, env=env)
+            with phase("commit"):
+                run_git(["git", "commit", "-m", msg, "--date", date], env=env)
+
+        progress(state["index"] - 1, ts, msg)
+        if checkpoint_due(state):
+            state["sha"] = read_git(["git", "rev-parse", "--verify", "-q", "HEAD"]) or None
+            write_journal(state)
+
+    store.report()
+    state["sha"] = read_git(["git", "rev-parse", "--verify", "-q", "HEAD"]) or None
+    write_journal(state, done=True)
+
+def commit_fast_import(commits, state):
+    # Continue an existing branch instead of letting fast-import refuse the non fast-forward
+    parent = read_git(["git", "rev-parse", "--verify", "-q", "refs/heads/main"])
+    # stdout carries `get-mark` answers for journal checkpoints
+    import subprocess, tempfile
+    # stderr goes to a file: a pipe nobody drains could stall the stream
+    errors = tempfile.TemporaryFile()
+    started = time.perf_counter()
+    proc = subprocess.Popen(["git", "fast-import", "--quiet", "--date-format=raw"], cwd=REPO_DIR,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=errors)
+    out = proc.stdin
+    store = BlobStore()
+    files = {p: store.intern(c) for p, c in state["files"].items()} # path -> blob sha
+    # blob sha -> fast-import dataref: a mark for blobs sent once in the stream, the id for shared-store blobs
+    marks = {sha: sha.hex().encode() for sha in state["shared"]}
+    next_mark = 1
+    heads = {} # branch -> mark of its tip in the stream; a branch's first commit starts from main's
+    ident = f"{USER_NAME} <{USER_EMAIL}>".encode('utf-8')
+
+    try:
+        for ts_dt, msg, changes, *dag in commits:
+            ref, merged = dag or ("main", None)
+            ts = ts_dt.strftime('%Y-%m-%d %H:%M:%S')
+            # Unchanged content would make `git commit` a no-op, so skip the commit the same way
+            changed = []
+            with phase("materialize"):
+                for f_path, f_content in changes:
+                    sha = store.intern(f_content)
+                    # A merge lays the branch's versions over main's tree, changed for main or not
+                    if files.get(f_path) != sha or merged:
+                        files[f_path] = sha
+                        changed.append((f_path, sha))
+            if merged and merged not in heads:
+                changed = [] # The branch never made a commit
+            if changed:
+                with phase("stage"):
+                    for f_path, sha in changed:
+                        if sha not in marks:
+                            marks[sha] = b":%d" % next_mark
+                            next_mark += 1
+                            data = store.content(sha)
+                            if isinstance(data, Asset):
+                                out.write(b"blob\nmark %s\ndata %d\n" % (marks[sha], data.length()))
+                                for chunk in data.chunks():
+                                    out.write(chunk)
+                                out.write(b"\n")
+                            else:
+                                out.write(b"blob\nmark %s\ndata %d\n%s\n" % (marks[sha], len(data), data))
+                phase_started = time.perf_counter()
+                date = git_date(ts_dt).encode()
+                msg_bytes = msg.encode('utf-8') + b"\n" # `git commit -m` terminates the message
+                commit_mark = next_mark
+                next_mark += 1
+                out.write(b"commit refs/heads/%s\nmark :%d\n" % (ref.encode('utf-8'), commit_mark))
+                out.write(b"author %s %s\ncommitter %s %s\n" % (ident, date, ident, date))
+                out.write(b"data %d\n%s" % (len(msg_bytes), msg_bytes))
+                if ref not in heads:
+                    start = heads.get("main", parent.encode() if parent else None)
+                    if start: out.write(b"from %s\n" % start)
+                if merged:
+                    out.write(b"merge %s\n" % heads.pop(merged))
+                for f_path, sha in changed:
+                    out.write(b"M 100644 %s %s\n" % (marks[sha], f_path.encode('utf-8')))
+                if merged:
+                    out.write(b"reset refs/heads/%s\n\n" % merged.encode('utf-8')) # Merged branches are deleted
+                heads[ref] = b":%d" % commit_mark
+                PHASE_TIMES["commit"] = PHASE_TIMES.get("commit", 0.0) + time.perf_counter() - phase_started
+
+            progress(state["index"] - 1, ts, msg)
+            if checkpoint_due(state) and "main" in heads:
+                # `checkpoint` flushes the pack and refs to disk before the journal points at them
+                with phase("commit"):
+                    out.write(b"checkpoint\nget-mark %s\n" % heads["main"])
+                    out.flush()
+                    sha = proc.stdout.readline().decode().strip()
+                    if not sha: raise BrokenPipeError("git fast-import exited")
+                    state["sha"] = sha
+                    write_journal(state)
+    except BrokenPipeError:
+        pass # fast-import stopped reading; its exit status and report are checked below
+    except BaseException:
+        # Never let a half-written stream be committed behind the journal's back
+        proc.kill()
+        raise
+
+    with phase("commit"):
+        try:
+            out.close()
+        except BrokenPipeError:
+            pass
+        proc.wait()
+    errors.seek(0)
+    stderr = errors.read().decode('utf-8', 'replace')
+    emit("git", args=proc.args, returncode=proc.returncode, stderr=stderr, seconds=time.perf_counter() - started)
+    errors.close()
+    if proc.returncode:
+        # The journal keeps pointing at the last checkpoint fast-import confirmed
+        raise SystemExit(f"[!] git fast-import exited with {proc.returncode}: {stderr.strip()}")
+    store.report()
+    state["sha"] = read_git(["git", "rev-parse", "--verify", "-q", "HEAD"]) or None
+    write_journal(state, done=True)
+    # Materialize the imported tip into the index and working tree
+    with phase("materialize"):
+        run_git(["git", "reset", "--hard", "-q"])
+
+# ==============================================================================
+# [4. PACKFILE ENGINE - NO GIT BINARY REQUIRED]
+# ==============================================================================
+def _delta_varint(n):
+    out = bytearray()
+    while True:
+        byte = n & 0x7f
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return out
+
+def _common_prefix(a, b):
+    lo, hi = 0, min(len(a), len(b))
+    a, b = memoryview(a), memoryview(b)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]: lo = mid
+        else: hi = mid - 1
+    return lo
+
+def _common_suffix(a, b, limit):
+    lo, hi = 0, limit
+    a, b = memoryview(a), memoryview(b)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]: lo = mid
+        else: hi = mid - 1
+    return lo
+
+def _delta_copy(out, offset, size):
+    while size:
+        n = min(size, 0x10000)
+        cmd, args = 0x80, bytearray()
+        for i in range(4):
+            byte = (offset >> (8 * i)) & 0xff
+            if byte:
+                cmd |= 1 << i
+                args.append(byte)
+        # A size of 0x10000 is encoded with no size bytes at all
+        for i in range(3):
+            byte = ((n & 0xffff) >> (8 * i)) & 0xff
+            if byte:
+                cmd |= 0x10 << i
+                args.append(byte)
+        out.append(cmd)
+        out += args
+        offset += n
+        size -= n
+
+def _delta_insert(out, data):
+    for i in range(0, len(data), 0x7f):
+        chunk = data[i:i + 0x7f]
+        out.append(len(chunk))
+        out += chunk
+
+def encode_delta(base, target):
+    # Versions of one path mostly grow or change in the middle (README newlines, package.json version),
+    # so copy the shared prefix/suffix from the base; inside the changed middle, lines that also occur in
+    # the base (rotated filler notes, shifted tree entries) are copied too and the rest is inserted literally
+    prefix = _common_prefix(base, target)
+    suffix = _common_suffix(base, target, min(len(base), len(target)) - prefix)
+    out = _delta_varint(len(base)) + _delta_varint(len(target))
+    _delta_copy(out, 0, prefix)
+    middle = target[prefix:len(target) - suffix]
+    if len(middle) > 64:
+        index, offset = {}, 0
+        for line in base.splitlines(keepends=True):
+            index.setdefault(line, offset)
+            offset += len(line)
+        copy_start = copy_end = None
+        literal = bytearray()
+        for line in middle.splitlines(keepends=True):
+            found = index.get(line) if len(line) >= 8 else None
+            if found is None:
+                if copy_start is not None:
+                    _delta_copy(out, copy_start, copy_end - copy_start)
+                    copy_start = None
+                literal += line
+            elif found == copy_end:
+                copy_end += len(line)
+            else:
+                _delta_insert(out, literal)
+                literal.clear()
+                if copy_start is not None: _delta_copy(out, copy_start, copy_end - copy_start)
+                copy_start, copy_end = found, found + len(line)
+        if copy_start is not None: _delta_copy(out, copy_start, copy_end - copy_start)
+        _delta_insert(out, literal)
+    else:
+        _delta_insert(out, middle)
+    _delta_copy(out, len(base) - suffix, suffix)
+    return bytes(out) if len(out) < len(target) else None
+
+def _pack_header(obj_type, size):
+    byte = (obj_type << 4) | (size & 0x0f)
+    size >>= 4
+    out = bytearray()
+    while size:
+        out.append(byte | 0x80)
+        byte = size & 0x7f
+        size >>= 7
+    out.append(byte)
+    return out
+
+def _ofs_encoding(distance):
+    out = bytearray([distance & 0x7f])
+    distance >>= 7
+    while distance:
+        distance -= 1
+        out.insert(0, 0x80 | (distance & 0x7f))
+        distance >>= 7
+    return out
+
+class PackWriter:
+    def __init__(self, pack_dir, known=None):
+        self.pack_dir = pack_dir
+        os.makedirs(pack_dir, exist_ok=True)
+        self.tmp_path = os.path.join(pack_dir, f"tmp_pack_{os.getpid()}")
+        self.f = open(self.tmp_path, "w+b")
+        self.start = 0 # Where the pack begins in the file; offsets count from here
+        self.f.write(b"PACK" + struct.pack(">II", 2, 0))
+        self.entries = [] # (sha, offset, crc32)
+        self.offsets = {} # Objects in this pack, the only valid delta bases
+        self.depths = {} # Delta chain depth of each object in this pack
+        self.known = set() if known is None else known # Objects in this or earlier packs of the run
+
+    def __contains__(self, sha):
+        return sha in self.known
+
+    def write(self, obj_type, data, sha, base_sha=None, base_data=None, packed=None):
+        # Deltas against `base_sha` (the previous version of the same path) until the chain gets too deep
+        if sha in self.known: return
+        if isinstance(data, Asset):
+            return self._write_stream(obj_type, data, sha)
+        delta = None
+        if base_sha in self.offsets and self.depths[base_sha] < MAX_DELTA_DEPTH and isinstance(base_data, bytes):
+            delta = encode_delta(base_data, data)
+        if delta:
+            self.put(sha, OBJ_OFS_DELTA, len(delta), zlib.compress(delta), base_sha)
+        else:
+            self.put(sha, obj_type, len(data), packed or zlib.compress(data))
+        return delta is not None
+
+    def put(self, sha, obj_type, size, payload, base_sha=None):
+        # Appends one compressed object; a delta names its base, whose offset is encoded here
+        offset = self.f.tell() - self.start
+        entry = _pack_header(obj_type, size)
+        if base_sha: entry += _ofs_encoding(offset - self.offsets[base_sha])
+        entry += payload
+        self.f.write(entry)
+        self.entries.append((sha, offset, zlib.crc32(entry)))
+        self._track(sha, offset, base_sha)
+
+    def _track(self, sha, offset, base_sha=None):
+        self.offsets[sha] = offset
+        self.depths[sha] = self.depths[base_sha] + 1 if base_sha else 0
+        self.known.add(sha)
+
+    def _write_stream(self, obj_type, asset, sha):
+        # Compressed chunk by chunk straight into the pack; assets are never deltified
+        offset = self.f.tell() - self.start
+        header = _pack_header(obj_type, asset.length())
+        self.f.write(header)
+        crc = zlib.crc32(header)
+        z = zlib.compressobj()
+        for chunk in asset.chunks():
+            piece = z.compress(chunk)
+            self.f.write(piece)
+            crc = zlib.crc32(piece, crc)
+        piece = z.flush()
+        self.f.write(piece)
+        self.entries.append((sha, offset, zlib.crc32(piece, crc)))
+        self._track(sha, offset)
+        return False
+
+    def _seal(self):
+        # Object count into the header, then the trailing checksum of everything from "PACK" on
+        f = self.f
+        f.seek(self.start + 8)
+        f.write(struct.pack(">I", len(self.entries)))
+        f.seek(self.start)
+        digest = hashlib.sha1()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        pack_sha = digest.digest()
+        f.write(pack_sha)
+        return pack_sha
+
+    def close(self):
+        f = self.f
+        if not self.entries:
+            f.close()
+            os.remove(self.tmp_path)
+            return None
+        pack_sha = self._seal()
+        f.close()
+
+        # Version 2 index: fan-out table, sorted names, CRCs, offsets (+ 64-bit table for >2GiB packs)
+        entries = sorted(self.entries)
+        idx = bytearray(b"\377tOc" + struct.pack(">I", 2))
+        fanout = [0] * 256
+        for sha, _, _ in entries:
+            fanout[sha[0]] += 1
+        total = 0
+        for count in fanout:
+            total += count
+            idx += struct.pack(">I", total)
+        for sha, _, _ in entries:
+            idx += sha
+        for _, _, crc in entries:
+            idx += struct.pack(">I", crc)
+        large = []
+        for _, offset, _ in entries:
+            if offset < 0x80000000:
+                idx += struct.pack(">I", offset)
+            else:
+                idx += struct.pack(">I", 0x80000000 | len(large))
+                large.append(offset)
+        for offset in large:
+            idx += struct.pack(">Q", offset)
+        idx += pack_sha
+        idx += hashlib.sha1(idx).digest()
+
+        name = os.path.join(self.pack_dir, f"pack-{pack_sha.hex()}")
+        with open(name + ".idx", "wb") as f:
+            f.write(idx)
+        os.replace(self.tmp_path, name + ".pack")
+        return pack_sha.hex()
+
+BUNDLE_SIGNATURE = b"# v2 git bundle\n"
+
+class BundleWriter(PackWriter):
+    # Writes a v2 bundle (header, refs, one pack) in a single pass. The tip is unknown until the last commit, so
+    # the ref lines go out as fixed-width placeholders and are overwritten in place when the pack is sealed.
+    def __init__(self, path, refs):
+        self.tmp_path = path + ".tmp"
+        self.path = path
+        self.refs = refs
+        self.f = open(self.tmp_path, "w+b")
+        self.f.write(BUNDLE_SIGNATURE)
+        self.f.write(b"".join(b"%s %s\n" % (b"0" * 40, ref) for ref in refs) + b"\n")
+        self.start = self.f.tell()
+        self.f.write(b"PACK" + struct.pack(">II", 2, 0))
+        self.entries = []
+        self.offsets = {}
+        self.depths = {}
+        self.known = set()
+
+    def close(self, tip):
+        self._seal()
+        self.f.seek(len(BUNDLE_SIGNATURE))
+        self.f.write(b"".join(b"%s %s\n" % (tip.hex().encode(), ref) for ref in self.refs))
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+class TreeNode:
+    # One directory of the in-memory tree model. Nodes are never modified once a commit uses them: setting a path
+    # copies only the nodes along it, so every untouched subtree (and its cached id) is shared with the parent
+    # commit's tree and only the changed path is re-hashed.
+    __slots__ = ("entries", "keys", "sha", "data", "base")
+
+    def __init__(self, entries=None, keys=None, base=None):
+        self.entries = entries if entries is not None else {} # name (bytes) -> TreeNode or blob sha
+        self.keys = keys if keys is not None else [] # sort keys in git order: directories sort as b"name/"
+        self.sha = None
+        self.data = None
+        self.base = base # previous version of this directory, its delta base until written
+
+    def set(self, parts, blob):
+        # parts: path split into bytes components; returns the new node, the receiver is left untouched
+        name = parts[0]
+        old = self.entries.get(name)
+        if len(parts) > 1:
+            value = (old if isinstance(old, TreeNode) else TreeNode()).set(parts[1:], blob)
+        else:
+            value = blob
+        entries = dict(self.entries)
+        entries[name] = value
+        keys = self.keys
+        key = name + b"/" if isinstance(value, TreeNode) else name
+        if old is None or isinstance(old, TreeNode) != isinstance(value, TreeNode):
+            keys = keys[:]
+            if old is not None: keys.remove(name + b"/" if isinstance(old, TreeNode) else name)
+            bisect.insort(keys, key)
+        return TreeNode(entries, keys, self if self.sha else self.base)
+
+    def write(self, writer):
+        # Hashes and stores the nodes created since the last commit and returns the tree id; shared subtrees
+        # already carry theirs
+        if self.sha is None:
+            parts = []
+            for key in self.keys:
+                if key[-1:] == b"/":
+                    parts.append(b"40000 %s\0%s" % (key[:-1], self.entries[key[:-1]].write(writer)))
+                else:
+                    parts.append(b"100644 %s\0%s" % (key, self.entries[key]))
+            self.data = b"".join(parts)
+            self.sha = object_id(OBJ_TREE, self.data)
+            base, self.base = self.base, None # Drop the link so earlier versions can be freed
+            writer.write(OBJ_TREE, self.data, self.sha, *((base.sha, base.data) if base else (None, None)))
+        return self.sha
+
+def write_bundle(path, plan_path=None):
+    # The pack engine's object stream straight into a .bundle: no repository, working tree or index on disk.
+    # `git clone run.bundle` (or fetch) gives the history a generated REPO_DIR would have.
+    if not plan_path: check_target()
+    if SEED is not None: random.seed(SEED)
+    started = time.perf_counter()
+    plan = open_plan(plan_path) if plan_path else None
+    state = new_state()
+    if plan: commits = plan.iter_commits(state)
+    else: commits = iter_commits(timed(TIMELINES[TIMELINE_ENGINE](timeline_seed()), "timeline"), state)
+    if BRANCHES: commits = branch_commits(commits, state)
+    writer = BundleWriter(path, (b"refs/heads/main", b"HEAD"))
+    store = BlobStore()
+    contents, blobs, root = pack_files({}, store)
+    tips = {"main": (None, root)}
+    parent = None
+    try:
+        for commit in commits:
+            ts_dt, msg = commit[:2]
+            pack_commit(commit, tips, store, writer, contents, blobs)
+            parent = tips["main"][0]
+            progress(state["index"] - 1, ts_dt.strftime('%Y-%m-%d %H:%M:%S'), msg)
+        if not parent:
+            raise SystemExit("[!] The run has no commits; nothing to bundle")
+        with phase("commit"):
+            writer.close(parent)
+    except BaseException:
+        writer.f.close()
+        os.remove(writer.tmp_path)
+        raise
+    finally:
+        if plan: plan.close()
+    store.report()
+    result = {"bundle": path, "commits": state["index"], "objects": len(writer.entries), "bytes": os.path.getsize(path),
+              "tip": parent.hex(), "seconds": time.perf_counter() - started}
+    emit("bundle", **result)
+    if VERBOSE:
+        print(f"[*] BUNDLE: {result['commits']} commits, {result['objects']} objects -> {path} "
+              f"({result['bytes'] / 2**20:.1f} MiB) in {result['seconds']:.2f}s")
+    return result
+
+def init_repo_native():
+    git_dir = os.path.join(REPO_DIR, ".git")
+    for sub in ("objects/pack", "objects/info", "refs/heads", "refs/tags"):
+        os.makedirs(os.path.join(git_dir, sub), exist_ok=True)
+    with open(os.path.join(git_dir, "HEAD"), "w") as f:
+        f.write("ref: refs/heads/main\n")
+    with open(os.path.join(git_dir, "config"), "w") as f:
+        f.write("[core]\n\trepositoryformatversion = 0\n\tfilemode = true\n\tbare = false\n\tlogallrefupdates = true\n")
+        f.write(f"[user]\n\tname = {USER_NAME}\n\temail = {USER_EMAIL}\n")
+
+def write_index(files):
+    # files: {path: blob sha} already present in the working tree; lets `git status` start clean
+    body = bytearray(b"DIRC" + struct.pack(">II", 2, len(files)))
+    for path in sorted(files, key=lambda p: p.encode('utf-8')):
+        st = os.stat(os.path.join(REPO_DIR, path))
+        name = path.encode('utf-8')
+        fields = (int(st.st_ctime), st.st_ctime_ns % 10**9, int(st.st_mtime), st.st_mtime_ns % 10**9,
+                  st.st_dev, st.st_ino, 0o100644, st.st_uid, st.st_gid, st.st_size)
+        entry = struct.pack(">10I", *(v & 0xffffffff for v in fields)) + files[path]
+        entry += struct.pack(">H", min(len(name), 0xfff)) + name
+        body += entry + b"\0" * (8 - len(entry) % 8)
+    body += hashlib.sha1(body).digest()
+    with open(os.path.join(REPO_DIR, ".git", "index"), "wb") as f:
+        f.write(body)
+
+def write_ref(sha):
+    with open(os.path.join(REPO_DIR, ".git", "refs", "heads", "main"), "w") as f:
+        f.write(sha + "\n")
+
+def pack_files(files, store):
+    # Pack-engine view of the files at the start of a run: (contents, blobs, root tree)
+    contents = {} # path -> (blob sha, raw bytes) of the current version, the next version's delta base
+    blobs = {} # path -> blob sha, for the final index
+    root = TreeNode()
+    for f_path, f_content in files.items():
+        sha = store.intern(f_content)
+        contents[f_path] = (sha, store.content(sha))
+        blobs[f_path] = sha
+        root = root.set(f_path.encode('utf-8').split(b"/"), sha)
+    return contents, blobs, root
+
+def pack_changes(changes, store, writer, contents, blobs, root):
+    # Writes the new blobs of one commit and returns its root tree (not yet written), or None when nothing changed
+    changed = []
+    with phase("materialize"):
+        for f_path, f_content in changes:
+            sha = store.intern(f_content)
+            if blobs.get(f_path) != sha:
+                changed.append((f_path, sha))
+    if not changed: return None
+    with phase("stage"):
+        for f_path, sha in changed:
+            data = store.content(sha)
+            # A new path has no delta base, so the store's cached zlib stream is used as-is
+            packed = None if f_path in contents or isinstance(data, Asset) else store.compressed(sha)
+            writer.write(OBJ_BLOB, data, sha, *contents.get(f_path, (None, None)), packed=packed)
+            contents[f_path] = (sha, data)
+            blobs[f_path] = sha
+            root = root.set(f_path.encode('utf-8').split(b"/"), sha)
+    return root
+
+def commit_object(tree, parent, ts_dt, msg, merge=None):
+    ident = f"{USER_NAME} <{USER_EMAIL}>".encode('utf-8')
+    date = git_date(ts_dt).encode()
+    body = b"tree %s\n" % tree.hex().encode()
+    if parent: body += b"parent %s\n" % parent.hex().encode()
+    if merge: body += b"parent %s\n" % merge.hex().encode()
+    body += b"author %s %s\ncommitter %s %s\n\n%s\n" % (ident, date, ident, date, msg.encode('utf-8'))
+    return body, object_id(OBJ_COMMIT, body)
+
+def pack_commit(commit, tips, store, writer, contents, blobs):
+    # Writes one commit of the stream onto its branch in `tips` (branch -> (commit id, root tree)); a branch's first
+    # commit forks from main's tip. A merge (see branch_commits) sets the merged branch's paths on main's tree, whose
+    # blobs the branch already wrote. Returns whether a commit was written.
+    ts_dt, msg, changes, *dag = commit
+    ref, merged = dag or ("main", None)
+    parent, root = tips.get(ref) or tips["main"]
+    other = None
+    if merged:
+        if merged not in tips: return False # The branch never made a commit
+        other = tips.pop(merged)[0]
+        for f_path, f_content in changes:
+            root = root.set(f_path.encode('utf-8').split(b"/"), store.intern(f_content))
+    else:
+        root = pack_changes(changes, store, writer, contents, blobs, root)
+        if not root: return False
+    with phase("commit"):
+        body, sha = commit_object(root.write(writer), parent, ts_dt, msg, other)
+        writer.write(OBJ_COMMIT, body, sha)
+    tips[ref] = (sha, root)
+    return True
+
+def commit_pack(commits, state):
+    git_dir = os.path.join(REPO_DIR, ".git")
+    pack_dir = os.path.join(git_dir, "objects", "pack")
+    if os.path.exists(os.path.join(git_dir, "refs", "heads", "main")) and not state["sha"]:
+        raise SystemExit("[!] The pack engine only extends histories it has a journal for; use another ENGINE.")
+
+    known = set(state["shared"]) # Shared-store blobs are already reachable through alternates
+    writer = PackWriter(pack_dir, known)
+    store = BlobStore()
+    contents, blobs, root = pack_files(state["files"], store)
+    parent = bytes.fromhex(state["sha"]) if state["sha"] else None
+    tips = {"main": (parent, root)}
+
+    for commit in commits:
+        ts_dt, msg = commit[:2]
+        pack_commit(commit, tips, store, writer, contents, blobs)
+        parent = tips["main"][0]
+
+        progress(state["index"] - 1, ts_dt.strftime('%Y-%m-%d %H:%M:%S'), msg)
+        if checkpoint_due(state) and parent:
+            # Seal the pack so far; the next one starts fresh (deltas never cross packs)
+            with phase("commit"):
+                writer.close()
+                write_ref(parent.hex())
+                state["sha"] = parent.hex()
+                write_journal(state)
+                writer = PackWriter(pack_dir, known)
+
+    with phase("commit"):
+        writer.close()
+    store.report()
+    if parent:
+        write_ref(parent.hex())
+        state["sha"] = parent.hex()
+    write_journal(state, done=True)
+    # Materialize the final tree without a checkout
+    with phase("materialize"):
+        for f_path, (_, data) in contents.items():
+            create_file(f_path, data)
+        write_index(blobs)
+
+# ==============================================================================
+# [5. PLAN FORMAT - PLAN ONCE, APPLY ANYWHERE]
+# ==============================================================================
+# A plan is every commit of a run decided up front: timestamp, message and changed files. It is one file of
+# little-endian fixed-width columns, so applying it maps the file and indexes straight into it:
+#
+#   ts         int64[commits]        epoch seconds
+#   tz         int16[commits]        UTC offset in minutes
+#   msg        uint32[commits]       string index of the message
+#   changes    uint64[commits + 1]   commit i changes change rows changes[i]:changes[i + 1]
+#   path       uint32[change rows]   string index of the path
+#   blob       uint32[change rows]   blob index of the new content
+#   str_off    uint64[strings + 1]   string i is str_data[str_off[i]:str_off[i + 1]], UTF-8
+#   blob_ids   20 bytes per blob     git blob ids, so applying never hashes content again
+#   blob_off   uint64[blobs + 1]     blob i is blob_data[blob_off[i]:blob_off[i + 1]]
+#   meta       JSON                  identity and config the plan was made with
+#
+# The header holds the magic, the four counts and an (offset, length) pair per section; sections are 8-byte aligned.
+PLAN_MAGIC = b"LYNKPLN1"
+PLAN_SECTIONS = ("ts", "tz", "msg", "changes", "path", "blob", "str_off", "str_data", "blob_ids", "blob_off",
+                 "blob_data", "meta")
+PLAN_COLUMNS = {"ts": "q", "tz": "h", "msg": "I", "changes": "Q", "path": "I", "blob": "I", "str_off": "Q",
+                "blob_off": "Q"}
+PLAN_HEADER = struct.Struct("<8s4Q" + "2Q" * len(PLAN_SECTIONS))
+# Settings a plan carries to the host applying it
+PLAN_KEYS = ("PROJECT_NAME", "USER_NAME", "USER_EMAIL", "START_DATE", "END_DATE", "TARGET_COMMITS",
+             "TIMELINE_ENGINE", "FILLER_MODE", "SEED")
+
+def plan_time(ts_dt):
+    # (epoch seconds, UTC offset in minutes): what git_date() would write; naive datetimes are local wall-clock time
+    aware = ts_dt.astimezone() if ts_dt.tzinfo is None else ts_dt
+    return int(aware.timestamp()), int(aware.utcoffset().total_seconds()) // 60
+
+def plan_zone(minutes, zones={}):
+    zone = zones.get(minutes)
+    if zone is None:
+        zone = zones[minutes] = timezone(timedelta(minutes=minutes))
+    return zone
+
+class PlanColumns:
+    # Reading side of the plan layout, over any columns in it (the mapped Plan). Subclasses provide the
+    # ts/tz/msg/changes/path/blob columns plus string(i) and content(i). Slicing gives a PlanSlice, which
+    # copies nothing.
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __getitem__(self, key):
+        first, last, step = key.indices(len(self))
+        if step != 1: raise ValueError("plan slices are contiguous")
+        return PlanSlice(self, first, max(first, last))
+
+    def timestamp(self, i):
+        return datetime.fromtimestamp(self.ts[i], plan_zone(self.tz[i]))
+
+    def commit(self, i):
+        rows = range(self.changes[i], self.changes[i + 1])
+        return self.timestamp(i), self.string(self.msg[i]), [(self.string(self.path[r]), self.content(self.blob[r])) for r in rows]
+
+    def files_at(self, index):
+        # File contents after the first `index` commits, to pick a plan run up at a checkpoint
+        latest = {}
+        for r in range(self.changes[index]):
+            latest[self.path[r]] = self.blob[r]
+        return {self.string(p): self.content(b) for p, b in latest.items()}
+
+    def iter_commits(self, state, stop=None):
+        # Same contract as iter_commits(): (datetime, message, [(path, content)]) from state["index"] on
+        for i in range(state["index"], len(self) if stop is None else stop):
+            ts_dt, msg, changes = self.commit(i)
+            state["index"] = i + 1
+            state["last_ts"] = ts_dt
+            yield ts_dt, msg, changes
+
+class PlanSlice:
+    # Commits start:stop of a plan, e.g. the rest of a run handed to the sharded engine
+    __slots__ = ("plan", "start", "stop")
+
+    def __init__(self, plan, start, stop):
+        self.plan = plan
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+class PlanWriter:
+    # Columns are buffered in arrays and spilled to side files, then stitched behind the header on close, so
+    # writing a plan keeps only the string table and the blob id index in memory
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.columns = {name: array(code) for name, code in PLAN_COLUMNS.items()}
+        self.spill = {name: open(f"{path}.{name}.tmp", "w+b") for name in PLAN_SECTIONS if name != "meta"}
+        self.store = BlobStore()
+        self.strings = {} # string -> index
+        self.blobs = {} # blob sha -> index
+        self.current = {} # path index -> blob index of its current content
+        self.counts = {"commits": 0, "changes": 0, "str_data": 0, "blob_data": 0}
+        for name in ("changes", "str_off", "blob_off"):
+            self.columns[name].append(0)
+
+    def _push(self, name, value):
+        column = self.columns[name]
+        column.append(value)
+        if len(column) >= 65536: self._flush(name)
+
+    def _flush(self, name):
+        column = self.columns[name]
+        if sys.byteorder == "big": column.byteswap()
+        column.tofile(self.spill[name])
+        del column[:]
+
+    def _string(self, text):
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+            data = text.encode('utf-8')
+            self.spill["str_data"].write(data)
+            self.counts["str_data"] += len(data)
+            self._push("str_off", self.counts["str_data"])
+        return index
+
+    def _blob(self, content):
+        sha = self.store.intern(content)
+        index = self.blobs.get(sha)
+        if index is None:
+            index = self.blobs[sha] = len(self.blobs)
+            data = self.store.content(sha)
+            self.spill["blob_ids"].write(sha)
+            if isinstance(data, Asset):
+                for chunk in data.chunks():
+                    self.spill["blob_data"].write(chunk)
+                self.counts["blob_data"] += data.length()
+            else:
+                self.spill["blob_data"].write(data)
+                self.counts["blob_data"] += len(data)
+            self._push("blob_off", self.counts["blob_data"])
+        return index
+
+    def add(self, ts_dt, msg, changes):
+        epoch, minutes = plan_time(ts_dt)
+        self._push("ts", epoch)
+        self._push("tz", minutes)
+        self._push("msg", self._string(msg))
+        for f_path, f_content in changes:
+            path, blob = self._string(f_path), self._blob(f_content)
+            # Rewriting a path with its current content is no change; the engines would skip it anyway
+            if self.current.get(path) == blob: continue
+            self.current[path] = blob
+            self._push("path", path)
+            self._push("blob", blob)
+            self.counts["changes"] += 1
+        self._push("changes", self.counts["changes"])
+        self.counts["commits"] += 1
+
+    def close(self):
+        for name in self.columns: self._flush(name)
+        meta = json.dumps(self.meta, default=str).encode('utf-8')
+        lengths = [self.spill[name].tell() if name != "meta" else len(meta) for name in PLAN_SECTIONS]
+        layout = []
+        offset = PLAN_HEADER.size
+        for length in lengths:
+            offset += -offset % 8
+            layout += [offset, length]
+            offset += length
+        header = PLAN_HEADER.pack(PLAN_MAGIC, self.counts["commits"], self.counts["changes"], len(self.strings),
+                                  len(self.blobs), *layout)
+        with open(self.path + ".tmp", "wb") as out:
+            out.write(header)
+            for i, name in enumerate(PLAN_SECTIONS):
+                out.write(b"\0" * (layout[2 * i] - out.tell()))
+                if name == "meta":
+                    out.write(meta)
+                    continue
+                spill = self.spill[name]
+                spill.seek(0)
+                shutil.copyfileobj(spill, out, 1 << 20)
+                spill.close()
+                os.remove(spill.name)
+        os.replace(self.path + ".tmp", self.path)
+        return offset
+
+class Plan(PlanColumns):
+    # Read-only view of a plan file: every column is a memoryview into the mapping, so nothing is parsed up front
+    # and any commit can be read in O(1)
+    def __init__(self, path):
+        self.file_path = os.path.abspath(path)
+        self.file = open(self.file_path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        fields = PLAN_HEADER.unpack_from(self.map, 0)
+        if fields[0] != PLAN_MAGIC:
+            raise SystemExit(f"[!] {path} is not a LYNK plan file")
+        self.view = memoryview(self.map)
+        for i, name in enumerate(PLAN_SECTIONS):
+            offset, length = fields[5 + 2 * i:7 + 2 * i]
+            if name == "blob_data": self.blob_data_offset = offset
+            section = self.view[offset:offset + length]
+            if name in PLAN_COLUMNS:
+                section = section.cast(PLAN_COLUMNS[name])
+                if sys.byteorder == "big":
+                    # Big-endian hosts pay for one swapped copy of each column
+                    column = array(PLAN_COLUMNS[name], section)
+                    column.byteswap()
+                    section = memoryview(column)
+            setattr(self, name, section)
+        self.config = json.loads(bytes(self.meta))
+        self._strings = {}
+
+    def string(self, i):
+        text = self._strings.get(i)
+        if text is None:
+            text = self._strings[i] = bytes(self.str_data[self.str_off[i]:self.str_off[i + 1]]).decode('utf-8')
+        return text
+
+    def content(self, i):
+        sha = bytes(self.blob_ids[20 * i:20 * i + 20])
+        start, end = self.blob_off[i], self.blob_off[i + 1]
+        if end - start > ASSET_CHUNK:
+            # Large blobs stay in the plan file and are streamed from there
+            return Asset(self.file_path, self.blob_data_offset + start, end - start, sha)
+        return Blob(sha, bytes(self.blob_data[start:end]))
+
+    def close(self):
+        for name in PLAN_SECTIONS:
+            getattr(self, name).release()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+def write_plan(path):
+    # The plan stage: decides every commit of the configured run, without touching any repository
+    check_target()
+    if SEED is not None: random.seed(SEED)
+    started = time.perf_counter()
+    meta = {key.lower(): globals()[key] for key in PLAN_KEYS}
+    writer = PlanWriter(path, meta)
+    state = new_state()
+    for ts_dt, msg, changes in iter_commits(TIMELINES[TIMELINE_ENGINE](timeline_seed()), state):
+        writer.add(ts_dt, msg, changes)
+    size = writer.close()
+    counts = writer.counts
+    if VERBOSE:
+        print(f"[*] PLAN: {counts['commits']} commits, {counts['changes']} changes, {len(writer.blobs)} blobs "
+              f"-> {path} ({size >> 10} KiB)")
+    return {"plan": path, "commits": counts["commits"], "bytes": size, "seconds": time.perf_counter() - started}
+
+def open_plan(path):
+    # The apply stage runs with the identity and config the plan was made with, wherever it is applied
+    global TARGET_COMMITS
+    plan = Plan(path)
+    apply_config({key: plan.config[key] for key in (k.lower() for k in PLAN_KEYS) if key in plan.config})
+    TARGET_COMMITS = len(plan)
+    return plan
+
+# Sharded pack engine: the plan is decided serially (one RNG stream), then the expensive part - blob deltas,
+# zlib and tree hashing - runs in worker processes, one shard of commits each. Shards end where the pack
+# engine seals a pack (every CHECKPOINT_EVERY commits), so no delta ever crosses a shard and a worker makes
+# exactly the decisions commit_pack() would. The stitcher writes the shards' objects back in order, adding
+# the commits (the parent chain is the only serial dependency), so the packs match a serial "pack" run.
+class KnownObjects(set):
+    # Writer stand-in that only records object ids: objects that live in an earlier pack
+    def write(self, obj_type, data, sha, *args, **kwargs):
+        self.add(sha)
+
+class SegmentWriter(PackWriter):
+    # PackWriter for a shard worker: same delta decisions against its own pack, but the compressed objects are
+    # collected for the stitcher instead of written
+    def __init__(self, known):
+        self.offsets = {}
+        self.depths = {}
+        self.known = known
+        self.objects = [] # (sha, type, size, zlib payload or Asset, delta base sha)
+
+    def put(self, sha, obj_type, size, payload, base_sha=None):
+        self.objects.append((sha, obj_type, size, payload, base_sha))
+        self._track(sha, len(self.objects), base_sha)
+
+    def _write_stream(self, obj_type, asset, sha):
+        self.objects.append((sha, obj_type, asset.length(), asset, None))
+        self._track(sha, len(self.objects))
+        return False
+
+def pack_segment(plan, start, stop, known):
+    # Objects of commits start:stop as commit_pack() would write them into a fresh pack: [(tree id, objects)]
+    store = BlobStore()
+    contents, blobs, root = pack_files(plan.files_at(start), store)
+    known.update(blobs.values())
+    root.write(known)
+    writer = SegmentWriter(known)
+    records = []
+    for i in range(start, stop):
+        new_root = pack_changes(plan.commit(i)[2], store, writer, contents, blobs, root)
+        tree = None
+        if new_root:
+            root = new_root
+            tree = root.write(writer)
+        records.append((tree, writer.objects))
+        writer.objects = []
+    return records
+
+_SHARD_PLAN = {}
+
+def _shard_init(plan_path, shared):
+    HOOKS.clear() # Forked workers report nothing; the stitcher emits every commit
+    _SHARD_PLAN["plan"] = Plan(plan_path)
+    _SHARD_PLAN["shared"] = shared
+
+def _shard_worker(start, stop, seen):
+    # `seen`: blob indices of the shard that earlier shards already stored
+    plan = _SHARD_PLAN["plan"]
+    known = KnownObjects(_SHARD_PLAN["shared"])
+    known.update(bytes(plan.blob_ids[20 * b:20 * b + 20]) for b in seen)
+    return pack_segment(plan, start, stop, known)
+
+def stage_plan(state):
+    # Plan stage of a sharded run without a plan file: decides the run into .git, returning the open plan and
+    # the planning state (its files are the run's final files)
+    path = os.path.join(REPO_DIR, ".git", SHARD_PLAN_NAME)
+    writer = PlanWriter(path, {key.lower(): globals()[key] for key in PLAN_KEYS})
+    planned = new_state()
+    timestamps = TIMELINES[TIMELINE_ENGINE](state["timeline_seed"])
+    for ts_dt, msg, changes in iter_commits(timed(timestamps, "timeline"), planned):
+        writer.add(ts_dt, msg, changes)
+    writer.close()
+    state["task_idx"], state["fillers"] = planned["task_idx"], planned["fillers"]
+    return Plan(path), planned
+
+def commit_sharded(commits, state):
+    # commits: a PlanSlice, the rest of the run
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+    git_dir = os.path.join(REPO_DIR, ".git")
+    pack_dir = os.path.join(git_dir, "objects", "pack")
+    if os.path.exists(os.path.join(git_dir, "refs", "heads", "main")) and not state["sha"]:
+        raise SystemExit("[!] The sharded engine only extends histories it has a journal for; use another ENGINE.")
+    plan = commits.plan
+    size = CHECKPOINT_EVERY or SHARD_COMMITS
+    bounds = [] # Shards end on multiples of `size`, like the serial checkpoints
+    start = commits.start
+    while start < commits.stop:
+        stop = min(start - start % size + size, commits.stop)
+        bounds.append((start, stop))
+        start = stop
+    stored = set(plan.blob[:plan.changes[commits.start]]) # Blob indices stored before the next shard to submit
+
+    def submit(start, stop):
+        rows = plan.blob[plan.changes[start]:plan.changes[stop]]
+        seen = [b for b in set(rows) if b in stored]
+        stored.update(rows)
+        pending.append((start, stop, pool.submit(_shard_worker, start, stop, seen)))
+
+    known = set(state["shared"])
+    writer = PackWriter(pack_dir, known)
+    parent = bytes.fromhex(state["sha"]) if state["sha"] else None
+    jobs = SHARD_JOBS or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_shard_init, initargs=(plan.file_path, state["shared"])) as pool:
+        # Shards are submitted a bounded window ahead and stitched strictly in order
+        pending = deque()
+        for bound in bounds[:2 * jobs]: submit(*bound)
+        queue = iter(bounds[2 * jobs:])
+        while pending:
+            start, stop, future = pending.popleft()
+            bound = next(queue, None)
+            if bound: submit(*bound)
+            with phase("stage"):
+                records = future.result()
+                # An object an earlier shard already stored is skipped, as the serial writer skips it; a worker that
+                # used one as a delta base packed differently, so that shard is redone here with the full picture
+                skipped = {sha for _, objects in records for sha, *_ in objects if sha in known}
+                if any(base in skipped for _, objects in records for *_, base in objects):
+                    records = pack_segment(plan, start, stop, KnownObjects(known))
+            for i, (tree, objects) in zip(range(start, stop), records):
+                with phase("stage"):
+                    for sha, obj_type, size, payload, base_sha in objects:
+                        if sha in known: continue
+                        if isinstance(payload, Asset): writer._write_stream(obj_type, payload, sha)
+                        else: writer.put(sha, obj_type, size, payload, base_sha)
+                ts_dt, msg = plan.timestamp(i), plan.string(plan.msg[i])
+                if tree:
+                    with phase("commit"):
+                        body, parent = commit_object(tree, parent, ts_dt, msg)
+                        writer.write(OBJ_COMMIT, body, parent)
+                state["index"] = i + 1
+                state["last_ts"] = ts_dt
+                progress(i, ts_dt.strftime('%Y-%m-%d %H:%M:%S'), msg)
+            if stop < commits.stop and parent:
+                # Seal the shard's pack where commit_pack() would
+                with phase("commit"):
+                    writer.close()
+                    if checkpoint_due(state):
+                        write_ref(parent.hex())
+                        state["sha"] = parent.hex()
+                        write_journal(state)
+                    writer = PackWriter(pack_dir, known)
+
+    with phase("commit"):
+        writer.close()
+    if parent:
+        write_ref(parent.hex())
+        state["sha"] = parent.hex()
+    write_journal(state, done=True)
+    with phase("materialize"):
+        blobs = {}
+        for f_path, f_content in plan.files_at(len(plan)).items():
+            create_file(f_path, f_content if isinstance(f_content, Asset) else f_content.data)
+            blobs[f_path] = f_content.sha
+        write_index(blobs)
+
+# ==============================================================================
+# [6. REPOSITORY CACHE]
+# ==============================================================================
+# Finished repositories keyed by everything that decides their objects. An entry holds the packs, and the final
+# journal, which carries the branch tip and the working-tree contents:
+#   CACHE_DIR/<key>/pack-*.pack, pack-*.idx, journal.json
+# The journal's mtime is the entry's last use, for LRU eviction down to CACHE_BYTES.
+CACHE_FORMAT = 2 # Bumped whenever the same configuration starts generating a different history
+CACHE_KEYS = ("PROJECT_NAME", "USER_NAME", "USER_EMAIL", "START_DATE", "END_DATE", "TARGET_COMMITS", "SEED",
+              "TIMELINE_ENGINE", "WEEKDAY_WEIGHTS", "TZ_OFFSET_MINUTES", "BURST_PROBABILITY", "BURST_GAP_SECONDS",
+              "FILLER_MODE", "FILLER_DIR", "FILLER_FILES", "FILLER_FILE_BUDGET", "BRANCHES", "BRANCH_PROBABILITY",
+              "BRANCH_COMMITS")
+
+def local_offsets():
+    # Naive timestamps are dated in the host's zone (see git_date), so the same config commits different dates
+    # elsewhere: the host's UTC offset over START_DATE..END_DATE, one entry per change (DST) to the hour.
+    # None when the timeline yields fixed-offset timestamps.
+    if START_DATE.tzinfo is not None or (TIMELINE_ENGINE == "numpy" and TZ_OFFSET_MINUTES is not None):
+        return None
+    def offset(t):
+        return int(t.astimezone().utcoffset().total_seconds())
+    t, end = START_DATE - timedelta(days=1), END_DATE + timedelta(days=1)
+    offsets = [(t.isoformat(), offset(t))]
+    while t < end:
+        day = t + timedelta(days=1)
+        if offset(day) != offsets[-1][1]:
+            # Changed within the day: find the hours it changed at
+            for hour in range(1, 25):
+                at = t + timedelta(hours=hour)
+                if offset(at) != offsets[-1][1]: offsets.append((at.isoformat(), offset(at)))
+        t = day
+    return offsets
+
+def cache_key():
+    # The engine is not part of the key: every engine builds the same objects. The host's zone is, when it
+    # dates the commits.
+    config = {key: globals()[key] for key in CACHE_KEYS}
+    templates = {"tasks": rendered_tasks(), "filler_logs": FILLER_LOGS,
+                 "churn": [CHURN_NOTES, CHURN_ANCHORS, CHURN_MAX_NOTES, CHURN_RUN], "branch_features": BRANCH_FEATURES}
+    text = json.dumps([CACHE_FORMAT, config, templates, local_offsets()], sort_keys=True,
+                      default=lambda o: o.sha.hex() if isinstance(o, Asset) else str(o))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def cacheable(resume, append_until, plan_path):
+    # Only seeded, fresh runs are reproducible, and a hit must never land on top of an existing history.
+    # Repositories borrowing from a shared store are not self-contained, so they are never cached.
+    return bool(CACHE_DIR) and SEED is not None and not (resume or append_until or plan_path or SHARED_STORE) \
+        and not os.path.exists(os.path.join(REPO_DIR, ".git"))
+
+def cache_restore(key):
+    entry = os.path.join(CACHE_DIR, key)
+    cached_journal = os.path.join(entry, "journal.json")
+    if not os.path.exists(cached_journal): return None
+    with open(cached_journal, encoding='utf-8') as f:
+        record = json.load(f)
+    init_repo_native()
+    pack_dir = os.path.join(REPO_DIR, ".git", "objects", "pack")
+    for name in os.listdir(entry):
+        if name.startswith("pack-"): shutil.copyfile(os.path.join(entry, name), os.path.join(pack_dir, name))
+    write_ref(record["sha"])
+    shutil.copyfile(cached_journal, journal_path())
+    blobs = {}
+    for f_path, f_content in decode_files(record["files"]).items():
+        create_file(f_path, f_content)
+        blobs[f_path] = f_content.sha if isinstance(f_content, Asset) else object_id(OBJ_BLOB, f_content.encode('utf-8'))
+    write_index(blobs)
+    os.utime(cached_journal)
+    return record
+
+def cache_store(key):
+    git_dir = os.path.join(REPO_DIR, ".git")
+    objects = os.path.join(git_dir, "objects")
+    # The subprocess engine leaves loose objects; fold them into a pack first
+    if any(len(name) == 2 and os.listdir(os.path.join(objects, name)) for name in os.listdir(objects)):
+        run_git(["git", "repack", "-d", "-q"])
+    pack_dir = os.path.join(objects, "pack")
+    packs = [name for name in os.listdir(pack_dir) if name.startswith("pack-")]
+    size = sum(os.path.getsize(os.path.join(pack_dir, name)) for name in packs)
+    if size > CACHE_BYTES: return False
+
+    entry = os.path.join(CACHE_DIR, key)
+    staging = f"{entry}.tmp{os.getpid()}"
+    os.makedirs(staging)
+    for name in packs:
+        shutil.copyfile(os.path.join(pack_dir, name), os.path.join(staging, name))
+    shutil.copyfile(journal_path(), os.path.join(staging, "journal.json"))
+    # Another process may have cached the same key meanwhile; both entries are identical
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(staging, entry)
+    cache_evict(keep=key)
+    return True
+
+def cache_evict(keep=None):
+    # Drops least recently used entries until the cache fits CACHE_BYTES
+    entries = []
+    for key in os.listdir(CACHE_DIR):
+        cached_journal = os.path.join(CACHE_DIR, key, "journal.json")
+        if os.path.exists(cached_journal):
+            entries.append((os.path.getmtime(cached_journal), dir_size(os.path.join(CACHE_DIR, key)), key))
+    total = sum(size for _, size, _ in entries)
+    for _, size, key in sorted(entries):
+        if total <= CACHE_BYTES: break
+        if key == keep: continue
+        shutil.rmtree(os.path.join(CACHE_DIR, key), ignore_errors=True)
+        total -= size
+
+def cache_invalidate(everything=False):
+    # Removes the entry for the current configuration, or every entry
+    if not CACHE_DIR or not os.path.isdir(CACHE_DIR): return 0
+    keys = os.listdir(CACHE_DIR) if everything else [cache_key()]
+    removed = 0
+    for key in keys:
+        entry = os.path.join(CACHE_DIR, key)
+        if os.path.isdir(entry):
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+    print(f"[*] CACHE: removed {removed} entr{'y' if removed == 1 else 'ies'} from {CACHE_DIR}")
+    return removed
+
+# ==============================================================================
+# [7. SHARED OBJECT STORE]
+# ==============================================================================
+# With SHARED_STORE set, repositories borrow objects from one central object directory through
+# .git/objects/info/alternates. Every TASKS blob of a run is written there once, as a loose object, and the
+# engines leave those blobs out of the repository itself; only per-repository objects (fillers, trees, commits)
+# are stored locally. `detach` copies the borrowed objects in before a repository leaves this machine.
+
+def write_loose_object(objects_dir, obj_type, data, sha):
+    # Named by id and renamed into place, so concurrent writers of the same object cannot conflict
+    hexsha = sha.hex()
+    path = os.path.join(objects_dir, hexsha[:2], hexsha[2:])
+    if os.path.exists(path): return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    size = data.length() if isinstance(data, Asset) else len(data)
+    z = zlib.compressobj()
+    with open(f"{path}.tmp{os.getpid()}", "wb") as f:
+        f.write(z.compress(b"%s %d\0" % (TYPE_NAMES[obj_type], size)))
+        for chunk in (data.chunks() if isinstance(data, Asset) else (data,)):
+            f.write(z.compress(chunk))
+        f.write(z.flush())
+    os.replace(f.name, path)
+    return True
+
+def link_shared_store():
+    objects = os.path.abspath(SHARED_STORE)
+    for sub in ("info", "pack"):
+        os.makedirs(os.path.join(objects, sub), exist_ok=True)
+    info = os.path.join(REPO_DIR, ".git", "objects", "info")
+    os.makedirs(info, exist_ok=True)
+    with open(os.path.join(info, "alternates"), "w") as f:
+        f.write(objects + "\n")
+
+def seed_shared_store():
+    # Returns the ids of this run's TASKS blobs, all present in the shared store afterwards
+    objects = os.path.abspath(SHARED_STORE)
+    shared, written = set(), 0
+    for _, changes in rendered_tasks():
+        for _, f_content in changes:
+            if isinstance(f_content, Asset):
+                sha, data = f_content.sha, f_content
+            else:
+                data = f_content.encode('utf-8')
+                sha = object_id(OBJ_BLOB, data)
+            if sha not in shared:
+                written += write_loose_object(objects, OBJ_BLOB, data, sha)
+                shared.add(sha)
+    emit("shared_store", path=objects, blobs=len(shared), written=written)
+    return shared
+
+def detach():
+    # Makes REPO_DIR standalone: `repack -a` also packs the objects borrowed through alternates
+    alternates = os.path.join(REPO_DIR, ".git", "objects", "info", "alternates")
+    if not os.path.exists(alternates):
+        print(f"[*] DETACH: {REPO_DIR} has no shared object store")
+        return
+    if run_git(["git", "repack", "-a", "-d", "-q"]):
+        raise SystemExit("[!] git repack failed; the repository still depends on the shared object store")
+    os.remove(alternates)
+    print(f"[*] DETACH: {REPO_DIR} is standalone ({dir_size(os.path.join(REPO_DIR, '.git', 'objects')) >> 10} KiB of objects)")
+
+# ==============================================================================
+# [8. ENTRY POINT]
+# ==============================================================================
+ENGINES = {
+    "subprocess": commit_subprocess,
+    "fast-import": commit_fast_import,
+    "pack": commit_pack,
+    "sharded": commit_sharded,
+}
+
+# Module constants a manifest entry (or any other override) may set, keyed by lower-case name
+CONFIG_KEYS = ("PROJECT_NAME", "REPO_DIR", "USER_NAME", "USER_EMAIL", "START_DATE", "END_DATE",
+               "TARGET_COMMITS", "ENGINE", "SEED", "EVENT_LOG", "FILLER_MODE", "FILLER_FILES", "FILLER_FILE_BUDGET",
+               "TIMELINE_ENGINE", "WEEKDAY_WEIGHTS", "TZ_OFFSET_MINUTES",
+               "BURST_PROBABILITY", "BURST_GAP_SECONDS", "CACHE_DIR", "CACHE_BYTES", "TEMPLATE_VARS",
+               "FILLER_DIR", "CHECKPOINT_EVERY", "ASSET_DIR", "VERBOSE", "SHARED_STORE", "SHARD_JOBS", "SHARD_COMMITS",
+               "FINALIZE", "BRANCHES", "BRANCH_PROBABILITY", "BRANCH_COMMITS")
+
+def apply_config(overrides):
+    for key, value in overrides.items():
+        name = key.upper()
+        if name not in CONFIG_KEYS:
+            raise SystemExit(f"[!] Unknown config key: {key}")
+        if name in ("START_DATE", "END_DATE") and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        globals()[name] = value
+
+def init_repo():
     if not os.path.exists(REPO_DIR): os.makedirs(REPO_DIR)
     if not os.path.exists(os.path.join(REPO_DIR, ".git")):
-        run_git(["git", "init"])
-        run_git(["git", "config", "user.name", USER_NAME])
-        run_git(["git", "config", "user.email", USER_EMAIL])
-        run_git(["git", "checkout", "-b", "main"])
-
-    # 2. Timeline Mapping (Uniform)
-    total_seconds = (END_DATE - START_DATE).total_seconds()
-    step = total_seconds / TARGET_COMMITS
-    timestamps = []
-    
-    for i in range(TARGET_COMMITS):
-        base_time = START_DATE + timedelta(seconds=i*step)
-        jitter = random.uniform(-0.2 * step, 0.2 * step)
-        final_time = base_time + timedelta(seconds=jitter)
-        # Ensure consistent working hours (09:00 ~ 02:00)
-        if 2 < final_time.hour < 9: 
-            final_time = final_time.replace(hour=9, minute=random.randint(0,59))
-        timestamps.append(final_time)
-    timestamps.sort()
+        if ENGINE in ("pack", "sharded"):
+            init_repo_native()
+        else:
+            run_git(["git", "init"])
+            run_git(["git", "config", "user.name", USER_NAME])
+            run_git(["git", "config", "user.email", USER_EMAIL])
+            run_git(["git", "checkout", "-b", "main"])
+
+def resume_state(journal):
+    # Roll the branch back to the checkpointed commit; anything after it is replayed from the journal
+    global START_DATE, END_DATE, TARGET_COMMITS, ENGINE, TIMELINE_ENGINE, SEED, BRANCHES
+    run = journal["run"]
+    START_DATE = datetime.fromisoformat(run["start_date"])
+    END_DATE = datetime.fromisoformat(run["end_date"])
+    TARGET_COMMITS, ENGINE, TIMELINE_ENGINE, SEED = run["target_commits"], run["engine"], run["timeline_engine"], run["seed"]
+    BRANCHES = run.get("branches", False)
+    random.setstate(journal["rng"])
+    if ENGINE in ("pack", "sharded"):
+        pack_dir = os.path.join(REPO_DIR, ".git", "objects", "pack")
+        for name in os.listdir(pack_dir):
+            if name.startswith("tmp_pack_"): os.remove(os.path.join(pack_dir, name))
+        write_ref(journal["sha"])
+    else:
+        run_git(["git", "reset", "--hard", "-q", journal["sha"]])
+    state = new_state()
+    state.update({k: journal[k] for k in ("index", "task_idx", "fillers", "files", "last_ts", "sha")})
+    state["plan"], state["merges"] = journal.get("plan"), journal.get("merges", 0)
+    state["timeline_seed"] = journal.get("timeline_seed")
+    return state
+
+def append_state(journal, end_date):
+    # Extend a finished history to a new END_DATE at the same commit density, after its last commit
+    global START_DATE, END_DATE, TARGET_COMMITS
+    run = journal["run"]
+    step = (datetime.fromisoformat(run["end_date"]) - datetime.fromisoformat(run["start_date"])) / run["target_commits"]
+    last_ts = journal["last_ts"].replace(tzinfo=None) if END_DATE.tzinfo is None else journal["last_ts"]
+    START_DATE, END_DATE = last_ts + step, end_date
+    TARGET_COMMITS = int((END_DATE - START_DATE) / step)
+    if TARGET_COMMITS < 1:
+        raise SystemExit(f"[!] END_DATE is not after the last commit: {end_date} leaves no slot after {last_ts}.")
+    random.setstate(journal["rng"])
+    state = new_state()
+    state.update({k: journal[k] for k in ("task_idx", "fillers", "files", "last_ts", "sha")})
+    state["merges"] = journal.get("merges", 0)
+    return state
+
+@contextmanager
+def instrumented():
+    # Hooks live for one run, so batch and benchmark workers never stack them
+    saved_hooks = HOOKS[:]
+    log = EventLog(EVENT_LOG) if EVENT_LOG else None
+    if VERBOSE: HOOKS.append(ProgressDisplay())
+    if log: HOOKS.append(log)
+    try:
+        yield
+    finally:
+        HOOKS[:] = saved_hooks
+        if log: log.close()
+
+@contextmanager
+def deferred_gc():
+    # Auto-gc and auto-maintenance stay off for every git call of the run (`git commit` would otherwise stop to
+    # repack mid-run). Set through the environment (git >= 2.31), so the repository's config is never touched.
+    count = int(os.environ.get("GIT_CONFIG_COUNT") or 0)
+    added = {"GIT_CONFIG_COUNT": str(count + 2)}
+    for i, (key, value) in enumerate((("gc.auto", "0"), ("maintenance.auto", "false")), count):
+        added[f"GIT_CONFIG_KEY_{i}"] = key
+        added[f"GIT_CONFIG_VALUE_{i}"] = value
+    saved = {key: os.environ.get(key) for key in added}
+    os.environ.update(added)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None: os.environ.pop(key, None)
+            else: os.environ[key] = value
+
+def object_stats():
+    stats = {}
+    for line in read_git(["git", "count-objects", "-v"]).splitlines():
+        name, _, value = line.partition(": ")
+        if value.isdigit(): stats[name] = int(value)
+    # count-objects reports KiB
+    return {"loose": stats.get("count", 0), "packs": stats.get("packs", 0),
+            "bytes": (stats.get("size", 0) + stats.get("size-pack", 0)) << 10}
+
+def finalize():
+    # One pack with reachability bitmaps, a commit-graph with generation numbers and a multi-pack-index. A
+    # repository borrowing from SHARED_STORE keeps borrowed objects out of its pack, which rules out bitmaps.
+    def probe():
+        started = time.perf_counter()
+        read_git(["git", "rev-list", "--count", "--all"])
+        return time.perf_counter() - started
+
+    before = object_stats()
+    before["rev_list_seconds"] = probe()
+    shared = os.path.exists(os.path.join(REPO_DIR, ".git", "objects", "info", "alternates"))
+    steps = (("repack", ["git", "repack", "-a", "-d", "-q"] + (["-l"] if shared else ["--write-bitmap-index"])),
+             ("commit-graph", ["git", "commit-graph", "write", "--reachable", "--no-progress"]),
+             ("multi-pack-index", ["git", "multi-pack-index", "write", "--no-progress"]))
+    seconds = {}
+    for name, args in steps:
+        started = time.perf_counter()
+        if run_git(args):
+            raise SystemExit(f"[!] Finalization failed at `{' '.join(args[:2])}`; the repository is intact but unoptimized")
+        seconds[name] = time.perf_counter() - started
+    after = object_stats()
+    after["rev_list_seconds"] = probe()
+    report = {"before": before, "after": after, "seconds": seconds, "bitmaps": not shared}
+    emit("finalize", **report)
+    if VERBOSE:
+        print(f"[*] FINALIZE: {before['loose']} loose objects + {before['packs']} pack(s) ({before['bytes'] / 2**20:.1f} MiB) -> "
+              f"{after['loose']} loose + {after['packs']} pack ({after['bytes'] / 2**20:.1f} MiB)"
+              f"{', bitmaps' if not shared else ''}, commit-graph, multi-pack-index")
+        print("    " + ", ".join(f"{name} {s:.2f}s" for name, s in seconds.items()) +
+              f"; rev-list --count --all {before['rev_list_seconds']:.3f}s -> {after['rev_list_seconds']:.3f}s")
+    return report
+
+def generate(resume=False, append_until=None, plan_path=None):
+    with instrumented(), deferred_gc():
+        result = _generate(resume, append_until, plan_path)
+        if FINALIZE: result["finalize"] = finalize()
+        return result
+
+def _generate(resume, append_until, plan_path):
+    if SEED is not None: random.seed(SEED)
+    PHASE_TIMES.clear()
+    started = time.perf_counter()
+
+    # 1. Init
+    journal = None
+    if resume or append_until:
+        journal = read_journal()
+        if resume and journal["done"]:
+            raise SystemExit("[!] The journaled run already finished; use --append to extend it.")
+        if append_until and not journal["done"]:
+            raise SystemExit("[!] The journaled run was interrupted; --resume it before appending.")
+        if append_until and journal.get("plan"):
+            raise SystemExit("[!] A plan fixes every commit up front; --append only extends generated runs.")
+        plan_path = plan_path or journal.get("plan")
+    elif not plan_path:
+        check_target()
+    plan = open_plan(plan_path) if plan_path else None
+    key = cache_key() if cacheable(resume, append_until, plan_path) else None
+    if key:
+        with phase("cache"):
+            record = cache_restore(key)
+        if record:
+            emit("cache", key=key, hit=True)
+            if VERBOSE: print(f"[*] CACHE HIT: {key[:12]} restored from {CACHE_DIR}")
+            result = {"repo": REPO_DIR, "engine": ENGINE, "commits": TARGET_COMMITS, "seconds": time.perf_counter() - started}
+            emit("run_end", phases=dict(PHASE_TIMES), cached=True, **result)
+            return result
+    init_repo()
+    state = new_state()
+    if journal:
+        state = resume_state(journal) if resume else append_state(journal, append_until)
+    if state["timeline_seed"] is None: state["timeline_seed"] = timeline_seed() # Fresh or appended timeline
+    if SHARED_STORE:
+        link_shared_store()
+        state["shared"] = seed_shared_store()
+
+    projected = project_git_size()
+    emit("run_start", repo=REPO_DIR, engine=ENGINE, timeline=TIMELINE_ENGINE, total=TARGET_COMMITS, first=state["index"],
+         projected_git_bytes=projected)
+    if VERBOSE: print(f"[*] PROJECTED .git SIZE: <= {projected / 2**20:.1f} MiB as loose objects ({FILLER_MODE} filler)")
+
+    # 2. Timeline Mapping (Uniform, streamed lazily into the commit loop), or the commits of a plan
+    planned = None
+    if BRANCHES and ENGINE not in ("fast-import", "pack"):
+        raise SystemExit(f"[!] BRANCHES needs the fast-import or pack engine; the {ENGINE} engine writes a linear main.")
+    if ENGINE == "sharded" and not plan:
+        if state["sha"]:
+            raise SystemExit("[!] The sharded engine only resumes runs it planned; use another ENGINE to append.")
+        plan, planned = stage_plan(state)
+    if plan:
+        state["plan"] = plan.file_path
+        if state["index"]: state["files"] = plan.files_at(state["index"])
+        commits = plan[state["index"]:] if ENGINE == "sharded" else plan.iter_commits(state)
+    else:
+        timestamps = timed(TIMELINES[TIMELINE_ENGINE](state["timeline_seed"], state["index"], state["last_ts"]), "timeline")
+        commits = iter_commits(timestamps, state)
+    if BRANCHES: commits = branch_commits(commits, state)
 
     # 3. Execution
-    task_idx = 0
-    for i, ts_dt in enumerate(timestamps):
-        ts = ts_dt.strftime('%Y-%m-%d %H:%M:%S')
-        env = os.environ.copy()
-        env["GIT_AUTHOR_DATE"] = ts
-        env["GIT_COMMITTER_DATE"] = ts
-        
-        # Logic to choose between Task or Filler
-        if task_idx < len(TASKS):
-            msg, files = TASKS[task_idx] # Unpacking is now safe due to strict structure
-            for f_path, f_content in files:
-                create_file(f_path, f_content)
-            task_idx += 1
+    try:
+        ENGINES[ENGINE](commits, state)
+    finally:
+        if plan: plan.close()
+    if planned:
+        # The run's own plan is spent: journal it like a generated run, so it can be appended to
+        os.remove(plan.file_path)
+        state["plan"], state["files"], state["last_ts"] = None, planned["files"], planned["last_ts"]
+        write_journal(state, done=True)
+    if key:
+        with phase("cache"):
+            stored = cache_store(key)
+        emit("cache", key=key, hit=False, stored=stored)
+
+    result = {"repo": REPO_DIR, "engine": ENGINE, "commits": TARGET_COMMITS, "seconds": time.perf_counter() - started}
+    emit("run_end", phases=dict(PHASE_TIMES), **result)
+    return result
+
+def _batch_worker(index, variant, base_seed):
+    # Runs in a pool process: module globals are private to it, so a variant is just a set of overrides
+    global VERBOSE
+    VERBOSE = False
+    variant = dict(variant)
+    variant.setdefault("repo_dir", f"{variant.get('project_name', PROJECT_NAME)}-{index}")
+    if "seed" not in variant:
+        # Derived from the manifest seed and the entry position, never from the worker that picks it up
+        digest = hashlib.sha256(f"{base_seed}:{index}".encode()).digest()
+        variant["seed"] = int.from_bytes(digest[:8], "big")
+    apply_config(variant)
+    return generate()
+
+def run_batch(manifest_path, jobs=None):
+    # Manifest: {"seed": 1, "jobs": 4, "shared_store": "objects", "cache_dir": "cache", "repos": [{"project_name": ...,
+    # "repo_dir": ..., "target_commits": ...}, ...]}. Every entry gets its own seed, so batch repositories only go
+    # into the repository cache when the manifest (or the entry) names a cache_dir.
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    variants = manifest["repos"]
+    jobs = jobs or manifest.get("jobs") or os.cpu_count()
+    base_seed = manifest.get("seed", 0)
+    if manifest.get("shared_store"):
+        # One store for the whole batch unless an entry names its own
+        variants = [dict(v, shared_store=v.get("shared_store", manifest["shared_store"])) for v in variants]
+    variants = [dict(v, cache_dir=v.get("cache_dir", manifest.get("cache_dir"))) for v in variants]
+    print(f"[*] BATCH: {len(variants)} repositories, {jobs} workers")
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_batch_worker, i, v, base_seed) for i, v in enumerate(variants)]
+        for future in as_completed(futures):
+            r = future.result()
+            results.append(r)
+            print(f"    {r['repo']}: {r['commits']} commits in {r['seconds']:.2f}s ({r['commits'] / r['seconds']:.0f} commits/s)")
+
+    elapsed = time.perf_counter() - started
+    total = sum(r["commits"] for r in results)
+    print(f"[*] BATCH DONE: {total} commits across {len(results)} repositories in {elapsed:.2f}s ({total / elapsed:.0f} commits/s)")
+    return results
+
+# ==============================================================================
+# [9. RE-TIMING EXISTING HISTORY]
+# ==============================================================================
+IDENT_LINE = re.compile(rb"(author|committer|tagger) (.*) (-?\d+) ([+-]\d{4})\n")
+
+def retime(source):
+    # Streams `git fast-export` of `source` into `git fast-import` in REPO_DIR. Commits take the next timeline
+    # slot (START_DATE..END_DATE, jitter, working hours) as author and committer date, tags the date of the
+    # commit before them; everything else passes through byte for byte, blobs in ASSET_CHUNK pieces.
+    import subprocess, tempfile
+    global TARGET_COMMITS
+    started = time.perf_counter()
+    PHASE_TIMES.clear()
+    source = os.path.abspath(source)
+    init_repo()
+    if read_git(["git", "rev-parse", "--verify", "-q", "HEAD"]):
+        raise SystemExit(f"[!] {REPO_DIR} already has history; re-time into an empty directory.")
+    TARGET_COMMITS = int(read_git(["git", "-C", source, "rev-list", "--count", "--all"]) or 0)
+    if not TARGET_COMMITS:
+        raise SystemExit(f"[!] {source} has no commits to re-time.")
+    if SEED is not None: random.seed(SEED)
+    timestamps = timed(TIMELINES[TIMELINE_ENGINE](timeline_seed()), "timeline")
+    emit("run_start", repo=REPO_DIR, engine="retime", source=source, total=TARGET_COMMITS, first=0)
+
+    errors = tempfile.TemporaryFile()
+    export = subprocess.Popen(["git", "fast-export", "--all", "--signed-tags=strip"], cwd=source,
+                              stdout=subprocess.PIPE)
+    target = subprocess.Popen(["git", "fast-import", "--quiet", "--force"], cwd=REPO_DIR,
+                              stdin=subprocess.PIPE, stderr=errors)
+    src, out = export.stdout, target.stdin
+    index, ts_dt, date, in_commit = 0, None, None, False
+    try:
+        with phase("commit"):
+            for line in iter(src.readline, b""):
+                if line.startswith(b"commit "):
+                    ts_dt = next(timestamps)
+                    date = git_date(ts_dt).encode()
+                    in_commit = True
+                elif line.startswith(b"data "):
+                    out.write(line)
+                    size = int(line[5:])
+                    if in_commit:
+                        # The first data block of a commit is its message
+                        message = src.read(size)
+                        out.write(message)
+                        progress(index, ts_dt.strftime('%Y-%m-%d %H:%M:%S'),
+                                 message.split(b"\n", 1)[0].decode('utf-8', 'replace'))
+                        index += 1
+                        in_commit = False
+                    else:
+                        while size > 0:
+                            chunk = src.read(min(size, ASSET_CHUNK))
+                            if not chunk: break
+                            out.write(chunk)
+                            size -= len(chunk)
+                    continue
+                elif date and line.startswith((b"author ", b"committer ", b"tagger ")):
+                    match = IDENT_LINE.fullmatch(line)
+                    if match: line = b"%s %s %s\n" % (match.group(1), match.group(2), date)
+                out.write(line)
+            out.close()
+            target.wait()
+            export.wait()
+    except BaseException:
+        target.kill()
+        export.kill()
+        raise
+    errors.seek(0)
+    emit("git", args=target.args, returncode=target.returncode, stderr=errors.read().decode('utf-8', 'replace'),
+         seconds=time.perf_counter() - started)
+    errors.close()
+    if export.returncode or target.returncode:
+        raise SystemExit(f"[!] Re-timing failed (fast-export exited {export.returncode}, fast-import {target.returncode})")
+
+    # Same current branch as the source, then a working tree for it
+    with phase("materialize"):
+        head = read_git(["git", "-C", source, "symbolic-ref", "-q", "HEAD"])
+        if head: run_git(["git", "symbolic-ref", "HEAD", head])
+        run_git(["git", "reset", "--hard", "-q"])
+    result = {"repo": REPO_DIR, "engine": "retime", "commits": index, "seconds": time.perf_counter() - started}
+    emit("run_end", phases=dict(PHASE_TIMES), **result)
+    if VERBOSE: print(f"\n[*] RETIMED: {index} commits from {source} into {REPO_DIR} in {result['seconds']:.2f}s")
+    return result
+
+# ==============================================================================
+# [10. BENCHMARKS]
+# ==============================================================================
+BENCH_SIZES = (100, 1000, 10000, 100000)
+BENCH_ENGINES = ("fast-import", "pack") # "subprocess" forks twice per commit; add it explicitly for small sizes
+
+def dir_size(path):
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def _bench_worker(engine, size, overrides):
+    # One fresh process per run, so peak RSS and phase timers belong to this run alone. The process starts from
+    # the module defaults, so the command line's overrides are applied again here; the engine, size, repository
+    # and cache always come from the benchmark itself.
+    import resource, shutil, tempfile
+    global REPO_DIR, ENGINE, TARGET_COMMITS, SEED, VERBOSE, CACHE_DIR
+    apply_config(overrides)
+    REPO_DIR = tempfile.mkdtemp(prefix="lynk-bench-")
+    ENGINE, TARGET_COMMITS, VERBOSE, CACHE_DIR = engine, size, False, None
+    if SEED is None: SEED = 0
+    try:
+        result = generate()
+        git_bytes = dir_size(os.path.join(REPO_DIR, ".git"))
+    finally:
+        shutil.rmtree(REPO_DIR, ignore_errors=True)
+    # ru_maxrss is KiB on Linux (bytes on macOS); git children are reported separately
+    scale = 1 if os.uname().sysname == "Darwin" else 1024
+    return {
+        "engine": engine, "commits": size, "seconds": round(result["seconds"], 4),
+        "commits_per_second": round(size / result["seconds"], 1),
+        "phases": {name: round(seconds, 4) for name, seconds in PHASE_TIMES.items()},
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "peak_child_rss_bytes": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+        "git_dir_bytes": git_bytes,
+    }
+
+def run_benchmark(sizes=BENCH_SIZES, engines=BENCH_ENGINES, output="bench.json", baseline=None, overrides=None):
+    import multiprocessing, platform, subprocess
+    from concurrent.futures import ProcessPoolExecutor
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip() or None,
+        "python": platform.python_version(),
+        "git": subprocess.run(["git", "--version"], stdout=subprocess.PIPE, text=True).stdout.strip(),
+        "config": overrides or {},
+        "results": [],
+    }
+    ctx = multiprocessing.get_context("spawn")
+    for engine in engines:
+        for size in sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                r = pool.submit(_bench_worker, engine, size, overrides or {}).result()
+            report["results"].append(r)
+            phases = " ".join(f"{k}={v:.2f}s" for k, v in sorted(r["phases"].items()))
+            print(f"[*] {engine:<11} {size:>7} commits: {r['commits_per_second']:>9.1f} commits/s  {phases}  "
+                  f"rss={r['peak_rss_bytes'] >> 20}MiB .git={r['git_dir_bytes'] >> 10}KiB")
+
+    with open(output, "w", encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[*] BENCHMARK saved to {output}")
+
+    if baseline:
+        # Flag any engine/size whose throughput dropped more than 10% against the baseline file
+        with open(baseline, encoding='utf-8') as f:
+            before = {(r["engine"], r["commits"]): r for r in json.load(f)["results"]}
+        for r in report["results"]:
+            old = before.get((r["engine"], r["commits"]))
+            if not old: continue
+            ratio = r["commits_per_second"] / old["commits_per_second"]
+            flag = "  <-- REGRESSION" if ratio < 0.9 else ""
+            print(f"    {r['engine']:<11} {r['commits']:>7}: {ratio:.2f}x vs baseline{flag}")
+    return report
+
+# ==============================================================================
+# [11. DAEMON - WARM WORKERS BEHIND A LOCAL SOCKET]
+# ==============================================================================
+# `daemon` keeps DAEMON_WORKERS processes warm (modules imported, templates compiled, git in the page cache) and
+# takes jobs on a Unix socket, one JSON object per line each way:
+#
+#   {"op": "submit", "config": {...}, "priority": 0, "plan": null, "resume": false, "append": null} -> {"ok": true, "job": 1}
+#   {"op": "status"} / {"op": "status", "job": 1}       -> {"ok": true, "jobs": [...]} / {"ok": true, "job": {...}}
+#   {"op": "cancel", "job": 1}                          -> {"ok": true, "job": {...}}
+#   {"op": "shutdown"}                                  -> {"ok": true}
+#
+# `config` is a set of overrides like a batch manifest entry, applied over the daemon's own configuration.
+# Higher priorities run first, equal ones in submission order. A running job is cancelled from inside its
+# commit loop, so it stops at a commit boundary and its journal can be resumed later.
+class JobCancelled(Exception):
+    pass
+
+class JobReporter:
+    # Hook of a daemon worker: reports progress at most every PROGRESS_INTERVAL and raises JobCancelled on
+    # the commit after the daemon asked for it
+    def __init__(self, conn, job_id):
+        self.conn = conn
+        self.job_id = job_id
+        self.last = 0.0
+
+    def __call__(self, event):
+        if event["event"] == "run_start":
+            self.conn.send(("progress", self.job_id, event["first"], event["total"]))
+        elif event["event"] == "commit":
+            while self.conn.poll():
+                if self.conn.recv() == ("cancel", self.job_id): raise JobCancelled()
+            now = time.perf_counter()
+            if now - self.last >= PROGRESS_INTERVAL:
+                self.last = now
+                self.conn.send(("progress", self.job_id, event["index"] + 1, event["total"]))
+
+def _daemon_worker(conn, defaults):
+    # One warm worker: every job starts from the daemon's configuration, never from the previous job's
+    HOOKS.clear()
+    import subprocess, tempfile # Paid once here instead of once per job
+    rendered_tasks()
+    read_git(["git", "--version"])
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None: return
+        if job[0] == "cancel": continue # Arrived after the job it was meant for had finished
+        job_id, request = job
+        apply_config(defaults)
+        reporter = JobReporter(conn, job_id)
+        HOOKS.append(reporter)
+        try:
+            apply_config(request["config"])
+            append_until = datetime.fromisoformat(request["append"]) if request.get("append") else None
+            result = generate(resume=request.get("resume", False), append_until=append_until, plan_path=request.get("plan"))
+            conn.send(("done", job_id, result))
+        except JobCancelled:
+            conn.send(("cancelled", job_id, None))
+        except BaseException as e:
+            conn.send(("failed", job_id, str(e) or type(e).__name__))
+        finally:
+            HOOKS.remove(reporter)
+
+def job_status(job):
+    status = {key: job[key] for key in ("id", "state", "priority", "index", "total", "repo", "result", "error")}
+    if job["started"]:
+        elapsed = (job["finished"] or time.time()) - job["started"]
+        status["seconds"] = round(elapsed, 3)
+        status["commits_per_second"] = round(job["index"] / elapsed, 1) if elapsed > 0 else None
+    status["queued_seconds"] = round((job["started"] or time.time()) - job["submitted"], 3)
+    return status
+
+def run_daemon(socket_path=None, workers=None):
+    import heapq, multiprocessing, selectors, socket
+    path = socket_path or DAEMON_SOCKET
+    if os.path.exists(path):
+        try:
+            daemon_request({"op": "status"}, path)
+        except OSError:
+            os.remove(path) # Left behind by a daemon that did not shut down cleanly
         else:
-            msg = random.choice(FILLER_LOGS)
-            # Append comment to README to simulate activity without breaking code
-            with open(os.path.join(REPO_DIR, "README.md"), "a", encoding='utf-8') as f:
-                f.write(f"\n")
+            raise SystemExit(f"[!] A daemon is already listening on {path}")
+    if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+    defaults = {key.lower(): globals()[key] for key in CONFIG_KEYS}
+    defaults["verbose"] = False
+    defaults["event_log"] = None # The daemon's own log; a job names its own
+    workers = workers or DAEMON_WORKERS or os.cpu_count()
+
+    def spawn():
+        parent_conn, child_conn = multiprocessing.Pipe()
+        # Not a daemonic process: the sharded engine starts a pool of its own
+        proc = multiprocessing.Process(target=_daemon_worker, args=(child_conn, defaults))
+        proc.start()
+        child_conn.close()
+        worker = {"conn": parent_conn, "proc": proc, "job": None}
+        selector.register(parent_conn, selectors.EVENT_READ, ("worker", worker))
+        return worker
+
+    selector = selectors.DefaultSelector()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    server.setblocking(False)
+    selector.register(server, selectors.EVENT_READ, ("server", None))
+    pool = [spawn() for _ in range(workers)]
+    jobs = {}
+    queue = [] # (-priority, job id): heapq pops the highest priority, then the oldest
+    running = True
+    print(f"[*] DAEMON: {workers} warm workers listening on {path}")
+
+    def dispatch():
+        for worker in pool:
+            while worker["job"] is None and queue:
+                job = jobs[heapq.heappop(queue)[1]]
+                if job["state"] != "queued": continue # Cancelled while queued
+                job["state"], job["started"] = "running", time.time()
+                worker["job"] = job["id"]
+                worker["conn"].send((job["id"], job["request"]))
+                emit("job", job=job["id"], state="running")
+
+    def handle(request):
+        op = request.get("op")
+        if op == "submit":
+            job = {"id": len(jobs) + 1, "state": "queued", "priority": int(request.get("priority", 0)),
+                   "request": {key: request.get(key) for key in ("config", "plan", "resume", "append")},
+                   "repo": (request.get("config") or {}).get("repo_dir", REPO_DIR), "index": 0, "total": None,
+                   "result": None, "error": None, "submitted": time.time(), "started": None, "finished": None}
+            job["request"]["config"] = job["request"]["config"] or {}
+            jobs[job["id"]] = job
+            heapq.heappush(queue, (-job["priority"], job["id"]))
+            emit("job", job=job["id"], state="queued", priority=job["priority"])
+            return {"ok": True, "job": job["id"]}
+        if op == "status":
+            if request.get("job") is None:
+                return {"ok": True, "jobs": [job_status(job) for job in jobs.values()]}
+            job = jobs.get(request["job"])
+            return {"ok": True, "job": job_status(job)} if job else {"ok": False, "error": f"no job {request['job']}"}
+        if op == "cancel":
+            job = jobs.get(request.get("job"))
+            if not job:
+                return {"ok": False, "error": f"no job {request.get('job')}"}
+            if job["state"] == "queued":
+                job["state"], job["finished"] = "cancelled", time.time()
+            elif job["state"] == "running":
+                next(w for w in pool if w["job"] == job["id"])["conn"].send(("cancel", job["id"]))
+            return {"ok": True, "job": job_status(job)}
+        if op == "shutdown":
+            nonlocal running
+            running = False
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    def finish(worker, state, payload):
+        job = jobs[worker["job"]]
+        job["state"], job["finished"] = state, time.time()
+        if state == "done":
+            job["result"] = payload
+            job["index"] = payload["commits"]
+        elif state == "failed":
+            job["error"] = payload
+        worker["job"] = None
+        emit("job", job=job["id"], state=state, seconds=job["finished"] - job["started"])
+        if VERBOSE: print(f"[*] JOB {job['id']}: {state} ({job['repo']})")
+
+    try:
+        while running:
+            for key, _ in selector.select(timeout=1.0):
+                kind, data = key.data
+                if kind == "server":
+                    client, _ = server.accept()
+                    client.setblocking(True)
+                    selector.register(client, selectors.EVENT_READ, ("client", bytearray()))
+                elif kind == "client":
+                    chunk = key.fileobj.recv(1 << 16)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        key.fileobj.close()
+                        continue
+                    data += chunk
+                    while b"\n" in data:
+                        line, _, rest = bytes(data).partition(b"\n")
+                        data[:] = rest
+                        try:
+                            response = handle(json.loads(line))
+                        except (ValueError, TypeError, KeyError) as e:
+                            response = {"ok": False, "error": str(e)}
+                        key.fileobj.sendall(json.dumps(response, default=str).encode('utf-8') + b"\n")
+                else:
+                    try:
+                        message = data["conn"].recv()
+                    except EOFError:
+                        # The worker died mid-job: fail the job and replace the worker
+                        selector.unregister(data["conn"])
+                        data["proc"].join()
+                        if data["job"]: finish(data, "failed", f"worker exited with {data['proc'].exitcode}")
+                        pool[pool.index(data)] = spawn()
+                        continue
+                    kind, job_id, payload = message[0], message[1], message[2:]
+                    if kind == "progress":
+                        jobs[job_id]["index"], jobs[job_id]["total"] = payload
+                    else:
+                        finish(data, kind, payload[0])
+            dispatch()
+    finally:
+        for job in jobs.values():
+            if job["state"] == "queued": job["state"] = "cancelled"
+        for worker in pool:
+            try:
+                if worker["job"]: worker["conn"].send(("cancel", worker["job"]))
+                worker["conn"].send(None)
+            except OSError:
+                pass # Already gone
+        for worker in pool:
+            worker["proc"].join(timeout=30)
+            if worker["proc"].is_alive(): worker["proc"].terminate()
+        server.close()
+        os.remove(path)
+    print(f"[*] DAEMON STOPPED: {sum(job['state'] == 'done' for job in jobs.values())} of {len(jobs)} jobs done")
+
+def daemon_request(request, socket_path=None):
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path or DAEMON_SOCKET)
+        client.sendall(json.dumps(request, default=str).encode('utf-8') + b"\n")
+        response = bytearray()
+        while not response.endswith(b"\n"):
+            chunk = client.recv(1 << 16)
+            if not chunk: break
+            response += chunk
+    return json.loads(response)
+
+def submit_job(args, overrides):
+    overrides.setdefault("repo_dir", REPO_DIR)
+    for key in PATH_KEYS:
+        if isinstance(overrides.get(key), str): overrides[key] = os.path.abspath(overrides[key])
+    request = {"op": "submit", "config": overrides, "priority": args.priority, "resume": args.resume,
+               "plan": os.path.abspath(args.plan) if args.plan else None,
+               "append": args.append.isoformat() if args.append else None}
+    response = daemon_request(request, args.socket)
+    if not response["ok"]: raise SystemExit(f"[!] {response['error']}")
+    job_id = response["job"]
+    print(f"[*] JOB {job_id} queued")
+    if not args.wait: return 0
+    while True:
+        status = daemon_request({"op": "status", "job": job_id}, args.socket)["job"]
+        print_job(status)
+        if status["state"] in ("done", "failed", "cancelled"):
+            return 0 if status["state"] == "done" else 1
+        time.sleep(PROGRESS_INTERVAL)
+
+def print_job(status):
+    total = status["total"] if status["total"] is not None else "?"
+    rate = f"{status['commits_per_second']:.0f} commits/s" if status.get("commits_per_second") else "-"
+    line = f"{status['id']:>4}  {status['state']:<9}  p{status['priority']:<3} {status['index']}/{total}  {rate}  {status['repo']}"
+    if status["error"]: line += f"  ({status['error']})"
+    print(line)
 
-        run_git(["git", "add", "."], env=env)
-        run_git(["git", "commit", "-m", msg, "--date", ts], env=env)
-        
-        # Simple progress bar
-        print(f"[{i+1}/{TARGET_COMMITS}] {ts} - {msg}")
+# ==============================================================================
+# [12. COMMAND LINE]
+# ==============================================================================
+def verify():
+    # Checks the repository in REPO_DIR against its journal: branch tip, commit dates, working tree and objects
+    journal = read_journal()
+    problems = []
+    head = read_git(["git", "rev-parse", "--verify", "-q", "HEAD"])
+    if head != journal["sha"]:
+        problems.append(f"HEAD is {head or 'unborn'}, the journal recorded {journal['sha']}")
+    dates = [int(d) for d in read_git(["git", "log", "--format=%ct"]).split()]
+    if any(newer < older for newer, older in zip(dates, dates[1:])):
+        problems.append("commit dates go backwards")
+    if journal["last_ts"] and dates and dates[0] != int(journal["last_ts"].timestamp()):
+        problems.append("the last commit date differs from the journal")
+    if not journal["done"]:
+        problems.append(f"the run stopped at commit {journal['index']}; --resume it")
+    status = read_git(["git", "status", "--porcelain", "--untracked-files=no"])
+    if status:
+        problems.append(f"working tree differs from HEAD ({len(status.splitlines())} paths)")
+    if run_git(["git", "fsck", "--strict", "--no-progress"]):
+        problems.append("git fsck reported errors")
+    for problem in problems:
+        print(f"[!] {problem}")
+    print(f"[*] VERIFY {REPO_DIR}: {len(dates)} commits, {'OK' if not problems else f'{len(problems)} problem(s)'}")
+    return not problems
+
+def print_plan():
+    # The plan stage on stdout: one line per commit, nothing written anywhere
+    check_target()
+    if SEED is not None: random.seed(SEED)
+    for ts_dt, msg, changes in iter_commits(TIMELINES[TIMELINE_ENGINE](timeline_seed()), new_state()):
+        print(f"{git_date(ts_dt)}  {ts_dt.strftime('%Y-%m-%d %H:%M:%S')}  {msg}  ({len(changes)} file{'s' * (len(changes) != 1)})")
+
+def parse_overrides(args):
+    # --config files apply in order, then each --set KEY=VALUE (VALUE is JSON when it parses, a string otherwise)
+    overrides = {}
+    for path in args.config:
+        with open(path, encoding='utf-8') as f:
+            overrides.update(json.load(f))
+    for item in args.set:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"[!] --set expects KEY=VALUE, got {item!r}")
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    if args.event_log: overrides["event_log"] = args.event_log
+    if args.no_cache: overrides["cache_dir"] = None
+    return overrides
+
+COMMANDS = ("generate", "plan", "apply", "bundle", "retime", "verify", "detach", "finalize", "bench", "batch", "cache", "daemon",
+            "submit", "status", "cancel")
+# Overrides `submit` resolves against the client's working directory, since the daemon may run elsewhere
+PATH_KEYS = ("repo_dir", "event_log", "asset_dir", "cache_dir", "shared_store")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Without a subcommand everything belongs to `generate`, so `main.py --resume` keeps working
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["generate"] + list(argv)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", metavar="FILE", action="append", default=[],
+                        help="JSON object of config overrides, keyed like a batch manifest entry (repeatable)")
+    common.add_argument("--set", metavar="KEY=VALUE", action="append", default=[],
+                        help="override one config value, e.g. --set target_commits=5000 (repeatable)")
+    common.add_argument("--event-log", metavar="PATH", help="append JSON-lines instrumentation events to PATH")
+    common.add_argument("--no-cache", action="store_true", help="always generate, never read or fill the repository cache")
+
+    parser = argparse.ArgumentParser(description="Generate the LYNK repository history.")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    generate_cmd = commands.add_parser("generate", parents=[common], help="generate the repository (default)")
+    generate_cmd.add_argument("--resume", action="store_true", help="continue an interrupted run from its journal checkpoint")
+    generate_cmd.add_argument("--append", metavar="END_DATE", type=datetime.fromisoformat,
+                              help="extend a finished run with new commits up to END_DATE (ISO format)")
+    plan_cmd = commands.add_parser("plan", parents=[common], help="decide every commit without touching a repository")
+    plan_cmd.add_argument("output", nargs="?", help="plan file to write; without it the planned timeline is printed")
+    apply_cmd = commands.add_parser("apply", parents=[common], help="generate the repository from a plan file")
+    apply_cmd.add_argument("plan", help="plan file written by `plan`")
+    apply_cmd.add_argument("--resume", action="store_true", help="continue an interrupted apply from its journal checkpoint")
+    bundle_cmd = commands.add_parser("bundle", parents=[common],
+                                     help="write the history straight into a .bundle file, without a repository")
+    bundle_cmd.add_argument("output", help="bundle file to write, e.g. lynk.bundle")
+    bundle_cmd.add_argument("--plan", help="bundle the commits of this plan file")
+    retime_cmd = commands.add_parser("retime", parents=[common],
+                                     help="copy an existing repository's history with dates from the timeline")
+    retime_cmd.add_argument("source", help="repository to read with `git fast-export`; REPO_DIR receives the copy")
+    commands.add_parser("verify", parents=[common], help="check a generated repository against its journal")
+    commands.add_parser("detach", parents=[common], help="copy shared-store objects in, making the repository standalone")
+    commands.add_parser("finalize", parents=[common],
+                        help="repack with bitmaps and write a commit-graph and multi-pack-index for an existing repository")
+    bench_cmd = commands.add_parser("bench", parents=[common], help="benchmark the engines against temporary repositories")
+    bench_cmd.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=BENCH_SIZES,
+                           help="comma-separated commit counts to benchmark")
+    bench_cmd.add_argument("--engines", type=lambda s: s.split(","), default=BENCH_ENGINES,
+                           help="comma-separated engines to benchmark")
+    bench_cmd.add_argument("--output", default="bench.json", help="where to write benchmark results")
+    bench_cmd.add_argument("--baseline", help="earlier benchmark JSON to compare throughput against")
+    batch_cmd = commands.add_parser("batch", parents=[common], help="generate every repository listed in a JSON manifest")
+    batch_cmd.add_argument("manifest")
+    batch_cmd.add_argument("--jobs", type=int, help="maximum concurrent repositories")
+    cache_cmd = commands.add_parser("cache", parents=[common], help="manage the repository cache")
+    cache_cmd.add_argument("action", choices=("invalidate",))
+    cache_cmd.add_argument("--all", action="store_true", help="drop every entry, not just the current configuration's")
+    sock = argparse.ArgumentParser(add_help=False)
+    sock.add_argument("--socket", metavar="PATH", help="daemon socket (default: DAEMON_SOCKET)")
+    daemon_cmd = commands.add_parser("daemon", parents=[common, sock],
+                                     help="serve generation jobs to warm workers; options set every job's defaults")
+    daemon_cmd.add_argument("--workers", type=int, help="warm worker processes")
+    daemon_cmd.add_argument("--stop", action="store_true", help="ask a running daemon to shut down")
+    submit_cmd = commands.add_parser("submit", parents=[common, sock],
+                                     help="queue a generation job on the daemon; options are the job's config")
+    submit_cmd.add_argument("--priority", type=int, default=0, help="higher runs first (default 0)")
+    submit_cmd.add_argument("--plan", help="apply this plan file instead of generating")
+    submit_cmd.add_argument("--resume", action="store_true", help="continue the job's interrupted run")
+    submit_cmd.add_argument("--append", metavar="END_DATE", type=datetime.fromisoformat, help="extend the finished run to END_DATE")
+    submit_cmd.add_argument("--wait", action="store_true", help="report progress until the job ends")
+    status_cmd = commands.add_parser("status", parents=[sock], help="show the daemon's jobs")
+    status_cmd.add_argument("job", type=int, nargs="?")
+    cancel_cmd = commands.add_parser("cancel", parents=[sock], help="cancel a queued or running daemon job")
+    cancel_cmd.add_argument("job", type=int)
+    args = parser.parse_args(argv)
+    overrides = parse_overrides(args) if hasattr(args, "config") else {}
+    if args.command != "submit": apply_config(overrides)
+
+    if args.command == "plan":
+        if args.output: write_plan(args.output)
+        else: print_plan()
+    elif args.command == "verify":
+        return 0 if verify() else 1
+    elif args.command == "retime":
+        with instrumented():
+            retime(args.source)
+    elif args.command == "bundle":
+        with instrumented():
+            write_bundle(args.output, args.plan)
+    elif args.command == "detach":
+        detach()
+    elif args.command == "finalize":
+        with instrumented():
+            finalize()
+    elif args.command == "bench":
+        run_benchmark(args.sizes, args.engines, args.output, args.baseline, overrides)
+    elif args.command == "batch":
+        run_batch(args.manifest, args.jobs)
+    elif args.command == "cache":
+        cache_invalidate(everything=args.all)
+    elif args.command == "daemon":
+        if args.stop: daemon_request({"op": "shutdown"}, args.socket)
+        else:
+            with instrumented():
+                run_daemon(args.socket, args.workers)
+    elif args.command == "submit":
+        return submit_job(args, overrides)
+    elif args.command == "status":
+        response = daemon_request({"op": "status", "job": args.job}, args.socket)
+        if not response["ok"]: raise SystemExit(f"[!] {response['error']}")
+        for status in response["jobs"] if args.job is None else [response["job"]]:
+            print_job(status)
+    elif args.command == "cancel":
+        response = daemon_request({"op": "cancel", "job": args.job}, args.socket)
+        if not response["ok"]: raise SystemExit(f"[!] {response['error']}")
+        print_job(response["job"])
+    else:
+        plan_path = args.plan if args.command == "apply" else None
+        append_until = getattr(args, "append", None)
+        print(f"[*] INITIALIZING LYNK PROTOCOL (UNBREAKABLE WALLET ADAPTER)...")
+        print(f"[*] USER: {USER_NAME} <{USER_EMAIL}>")
+        print(f"[*] DATE RANGE: {START_DATE.strftime('%Y-%m-%d')} ~ {END_DATE.strftime('%Y-%m-%d')}")
+        print(f"[*] ENGINE: {ENGINE}")
+        generate(resume=args.resume, append_until=append_until, plan_path=plan_path)
+        print("\n[*] DONE. LYNK Protocol repository generated successfully.")
+    return 0
 
-    print("\n[*] DONE. LYNK Protocol repository generated successfully.")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())